@@ -0,0 +1,88 @@
+import ast
+import glob
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+from typing import Dict, Tuple
+
+
+# Parsed modules are pickled here as "<path key>-<version key>.pkl"; only the
+# latest version of each source file is kept
+CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "projectmapper",
+)
+
+# In-process layer so repeated lookups in one run skip unpickling as well;
+# maps a path to (version key, tree) so an edited file replaces its old tree
+_memory_cache: Dict[str, Tuple[str, ast.Module]] = {}
+
+
+def _path_key(path: str) -> str:
+    """Build the part of the cache file name identifying a source file and interpreter."""
+    return hashlib.blake2b(f"{path}|{sys.version}".encode(), digest_size=16).hexdigest()
+
+
+def _version_key(st: os.stat_result) -> str:
+    """Build the part of the cache file name identifying a version of a source file."""
+    return hashlib.blake2b(f"{st.st_mtime_ns}|{st.st_size}".encode(), digest_size=16).hexdigest()
+
+
+def load_ast(path: str) -> ast.Module:
+    """Return the parsed AST for a source file, using the on-disk cache when possible."""
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    version = _version_key(st)
+
+    cached = _memory_cache.get(path)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    path_key = _path_key(path)
+    cache_file = os.path.join(CACHE_DIR, f"{path_key}-{version}.pkl")
+    try:
+        with open(cache_file, "rb") as f:
+            tree = pickle.load(f)
+    except Exception:
+        # Missing or unreadable cache entry, fall back to parsing
+        tree = None
+
+    if not isinstance(tree, ast.Module):
+        with open(path, "rb") as f:
+            source = f.read()
+        tree = ast.parse(source, filename=path)
+        _write_cache(cache_file, tree)
+        _remove_stale(path_key, cache_file)
+
+    _memory_cache[path] = (version, tree)
+    return tree
+
+
+def _write_cache(cache_file: str, tree: ast.Module):
+    """Persist a parsed tree, ignoring failures (read-only home, full disk, ...)."""
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        # Write to a temp file and rename so concurrent readers never see partial pickles
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(tree, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_file)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+    except Exception:
+        pass
+
+
+def _remove_stale(path_key: str, cache_file: str):
+    """Delete pickles of older versions of the same source file."""
+    for stale in glob.glob(os.path.join(CACHE_DIR, f"{path_key}-*.pkl")):
+        if stale != cache_file:
+            try:
+                os.unlink(stale)
+            except OSError:
+                # Already removed by another process, or not ours to remove
+                pass
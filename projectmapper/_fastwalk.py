@@ -0,0 +1,165 @@
+"""Hot inner loop of code flow analysis.
+
+This module is plain, fully annotated Python so it can optionally be compiled
+with mypyc (``mypyc projectmapper/_fastwalk.py``). The resulting extension
+module takes precedence over this file on import; without it the pure-Python
+version below is used unchanged.
+"""
+import ast
+import re
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+
+def _compile_patterns(*patterns: str) -> "re.Pattern[str]":
+    """Compile substring patterns into a single regex alternation."""
+    return re.compile("|".join(re.escape(p) for p in patterns))
+
+
+# Attribute-chain fragments that identify database calls for each ORM/driver,
+# compiled into one alternation each so a chain is scanned once per ORM
+_SQLA_RE = _compile_patterns(
+    ".query", ".add", ".commit", ".delete", ".filter",
+    ".all", ".first", ".get", ".update", ".execute"
+)
+_TORTOISE_RE = _compile_patterns(
+    ".filter", ".get", ".create", ".delete", ".update",
+    ".all", ".first", ".save", ".values"
+)
+_MONGO_RE = _compile_patterns(
+    ".find", ".insert", ".update", ".delete", ".aggregate"
+)
+
+
+def get_attribute_chain(node: ast.AST) -> str:
+    """Get full attribute chain like a.b.c."""
+    parts: List[str] = []
+    while type(node) is ast.Attribute:
+        parts.append(node.attr)
+        node = node.value
+    parts.append(node.id if type(node) is ast.Name else "unknown")
+    return ".".join(reversed(parts))
+
+
+def classify_db_call(attr_chain: str) -> Optional[str]:
+    """Return the database type a method call belongs to, if any."""
+    # SQLAlchemy: session.query(), session.add(), Model.query, etc.
+    if _SQLA_RE.search(attr_chain):
+        return "sqlalchemy"
+    # Tortoise-ORM patterns
+    if _TORTOISE_RE.search(attr_chain):
+        if attr_chain.startswith("Model") or "models." in attr_chain:
+            return "tortoise-orm"
+        return None
+    # MongoDB with Motor or PyMongo
+    if _MONGO_RE.search(attr_chain):
+        if "collection" in attr_chain or "db." in attr_chain:
+            return "mongodb"
+    return None
+
+
+def fused_walk(tree: ast.AST) -> Tuple[List[str], List[Dict[str, Any]], Set[str]]:
+    """Collect calls, database operations and data references in one pre-order pass."""
+    calls: List[str] = []
+    db_operations: List[Dict[str, Any]] = []
+    data_references: Set[str] = set()
+
+    # AST node classes are never subclassed, so exact type checks replace
+    # isinstance() and its MRO walk on every node; they are written inline
+    # so type checkers (and mypyc) narrow `node` in each branch
+    stack: List[ast.AST] = [tree]
+    while stack:
+        node = stack.pop()
+        if type(node) is ast.Call:
+            func = node.func
+            if type(func) is ast.Name:
+                # Direct function call like function_name()
+                calls.append(func.id)
+            elif type(func) is ast.Attribute:
+                # Method call like object.method()
+                attr_chain = get_attribute_chain(func)
+                calls.append(attr_chain)
+                db_type = classify_db_call(attr_chain)
+                if db_type:
+                    db_operations.append({
+                        "type": db_type,
+                        "operation": attr_chain,
+                        "line": node.lineno
+                    })
+        elif type(node) is ast.Name:
+            # Variables that are read; a Name has no child nodes worth visiting
+            if type(node.ctx) is ast.Load:
+                data_references.add(node.id)
+            continue
+        elif type(node) is ast.arg:
+            # Function arguments
+            data_references.add(node.arg)
+
+        # Push children reversed so they are visited in source order
+        children = list(ast.iter_child_nodes(node))
+        children.reverse()
+        stack.extend(children)
+
+    return calls, db_operations, data_references
+
+
+def walk_call_chain(
+    calls_by_fn: Dict[str, Sequence[str]],
+    func_name: str,
+    cache: Dict[str, List[Dict[str, Any]]],
+    on_path: Set[str],
+) -> List[Dict[str, Any]]:
+    """Build the nested chain of calls made from a function, depth first without recursion."""
+    # Calls back into a function already on the current path are cut off
+    if func_name in on_path or func_name not in calls_by_fn:
+        return []
+    cached = cache.get(func_name)
+    if cached is not None:
+        return cached
+
+    # Frames of (function, its callees, chain built so far) plus the next
+    # callee position of each frame and whether its subtree is free of
+    # cycle cut-offs. A cut-off chain depends on the path it was reached by,
+    # so only complete chains are memoized.
+    stack: List[Tuple[str, Sequence[str], List[Dict[str, Any]]]] = [(func_name, calls_by_fn[func_name], [])]
+    positions: List[int] = [0]
+    complete: List[bool] = [True]
+    on_path.add(func_name)
+    result: List[Dict[str, Any]] = []
+    while stack:
+        name, callees, chain = stack[-1]
+        position = positions[-1]
+        if position == len(callees):
+            # Finished: memoize and hand the chain to the caller's frame
+            stack.pop()
+            positions.pop()
+            frame_complete = complete.pop()
+            on_path.discard(name)
+            if frame_complete:
+                cache[name] = chain
+            if stack:
+                stack[-1][2].append({"function": name, "calls": chain})
+                if not frame_complete:
+                    complete[-1] = False
+            else:
+                result = chain
+            continue
+
+        positions[-1] = position + 1
+        callee = callees[position]
+        if callee in on_path:
+            chain.append({"function": callee, "calls": []})
+            complete[-1] = False
+            continue
+        if callee not in calls_by_fn:
+            chain.append({"function": callee, "calls": []})
+            continue
+        cached = cache.get(callee)
+        if cached is not None:
+            chain.append({"function": callee, "calls": cached})
+            continue
+        on_path.add(callee)
+        stack.append((callee, calls_by_fn[callee], []))
+        positions.append(0)
+        complete.append(True)
+
+    return result
@@ -0,0 +1,44 @@
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup
+    orjson = None  # type: ignore[assignment]
+
+
+def _default(obj: Any) -> Any:
+    """Serialize values the JSON encoders don't handle natively."""
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj, key=str)
+    if hasattr(obj, "_asdict"):
+        # namedtuple records such as models.Field become JSON objects
+        return obj._asdict()
+    # Anything else (classes, enums, defaults of odd types) is shown by its repr-ish str
+    return str(obj)
+
+
+def _records_to_dicts(obj: Any) -> Any:
+    """Convert nested namedtuples to dicts, which the stdlib encoder would emit as arrays."""
+    if isinstance(obj, dict):
+        return {key: _records_to_dicts(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        if hasattr(obj, "_asdict"):
+            return {key: _records_to_dicts(value) for key, value in obj._asdict().items()}
+        return [_records_to_dicts(value) for value in obj]
+    return obj
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize to compact JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default)
+    return dumps_str(obj).encode("utf-8")
+
+
+def dumps_str(obj: Any) -> str:
+    """Serialize to a compact JSON string, using orjson when it is installed."""
+    if orjson is not None:
+        # orjson hands tuple subclasses (namedtuples) to default()
+        return orjson.dumps(obj, default=_default).decode("utf-8")
+    return json.dumps(_records_to_dicts(obj), separators=(",", ":"), default=_default)
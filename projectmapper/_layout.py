@@ -0,0 +1,181 @@
+import functools
+import json
+import shutil
+import subprocess
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# Spacing in pixels, matching the top-to-bottom layout the page used to run in the browser
+RANK_SEP = 70
+NODE_SEP = 50
+MARGIN = 20
+NODE_HEIGHT = 30
+CHAR_WIDTH = 7  # Approximate width of a 12px label character
+NODE_PADDING = 20
+
+# Longest a dot run may take before the built-in layout is used instead; the
+# page is generated inside a request handler
+DOT_TIMEOUT = 10
+
+# Graphviz works in points (and node sizes in inches); the page in CSS pixels
+_POINTS_PER_INCH = 72
+
+
+def _label_width(label: str) -> int:
+    """Estimate the rendered width of a node from its label."""
+    return max(40, len(label) * CHAR_WIDTH + NODE_PADDING)
+
+
+@functools.lru_cache(maxsize=None)
+def _dot_executable() -> Optional[str]:
+    """Locate the Graphviz dot binary, once per process."""
+    return shutil.which("dot")
+
+
+def _dot_quote(text: str) -> str:
+    """Quote a string for use as a DOT attribute value."""
+    return '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def layout_graph(nodes: List[Dict[str, Any]], edges: List[Dict[str, Any]]) -> Tuple[int, int]:
+    """
+    Position a directed graph top to bottom.
+
+    Nodes get ``x``/``y`` (centre), ``w`` and ``h``; edges get ``points``, a
+    polyline for a smooth curve from source to target. Edge ``source`` and
+    ``target`` are node indices. Returns the (width, height) of the drawing.
+    """
+    dot = _dot_executable()
+    if dot is not None and nodes:
+        try:
+            return _dot_layout(dot, nodes, edges)
+        except (OSError, subprocess.CalledProcessError, subprocess.TimeoutExpired, ValueError, KeyError):
+            # dot failed, took too long or produced output we can't read
+            pass
+    return _layered_layout(nodes, edges)
+
+
+def _dot_layout(dot: str, nodes: List[Dict[str, Any]], edges: List[Dict[str, Any]]) -> Tuple[int, int]:
+    """Lay the graph out with Graphviz dot, fed DOT text over a single pipe."""
+    lines = [
+        "digraph G {",
+        f"rankdir=TB; ranksep={RANK_SEP / _POINTS_PER_INCH:.3f}; nodesep={NODE_SEP / _POINTS_PER_INCH:.3f};",
+        f"node [shape=box, fontsize=12, height={NODE_HEIGHT / _POINTS_PER_INCH:.3f}];",
+    ]
+    # Nodes are named by index; labels may contain anything
+    lines.extend(f"{i} [label={_dot_quote(node['label'])}];" for i, node in enumerate(nodes))
+    lines.extend(f"{edge['source']} -> {edge['target']};" for edge in edges)
+    lines.append("}")
+
+    completed = subprocess.run(
+        [dot, "-Tjson"], input="\n".join(lines).encode("utf-8"), capture_output=True, check=True,
+        timeout=DOT_TIMEOUT
+    )
+    result = json.loads(completed.stdout)
+    _, _, graph_width, graph_height = (float(v) for v in result["bb"].split(","))
+
+    def point(pos: str) -> List[float]:
+        # Graphviz puts the origin at the bottom left, SVG at the top left
+        x, y = pos.split(",")
+        return [round(float(x) + MARGIN, 1), round(graph_height - float(y) + MARGIN, 1)]
+
+    for obj in result.get("objects", ()):
+        node = nodes[int(obj["name"])]
+        node["x"], node["y"] = point(obj["pos"])
+        node["w"] = round(float(obj["width"]) * _POINTS_PER_INCH)
+        node["h"] = round(float(obj["height"]) * _POINTS_PER_INCH)
+
+    for gv_edge in result.get("edges", ()):
+        edge = edges[gv_edge["_gvid"]]
+        # pos is "e,x,y x1,y1 ..." with an optional s/e arrow endpoint prefix
+        points = []
+        end = None
+        for token in gv_edge["pos"].split():
+            if token.startswith("e,"):
+                end = point(token[2:])
+            elif not token.startswith("s,"):
+                points.append(point(token))
+        if end is not None:
+            points.append(end)
+        edge["points"] = points
+
+    return round(graph_width) + 2 * MARGIN, round(graph_height) + 2 * MARGIN
+
+
+def _layered_layout(nodes: List[Dict[str, Any]], edges: List[Dict[str, Any]]) -> Tuple[int, int]:
+    """Lay the graph out in ranks by distance from its roots, in linear time."""
+    children: List[List[int]] = [[] for _ in nodes]
+    parents: List[List[int]] = [[] for _ in nodes]
+    for edge in edges:
+        children[edge["source"]].append(edge["target"])
+        parents[edge["target"]].append(edge["source"])
+
+    # Breadth-first ranks from the roots (routes); nodes only reachable
+    # through a cycle start a rank of their own
+    ranks = [-1] * len(nodes)
+    roots = [i for i in range(len(nodes)) if not parents[i]]
+    for root in roots + list(range(len(nodes))):
+        if ranks[root] >= 0:
+            continue
+        ranks[root] = 0
+        queue = deque((root,))
+        while queue:
+            i = queue.popleft()
+            for child in children[i]:
+                if ranks[child] < 0:
+                    ranks[child] = ranks[i] + 1
+                    queue.append(child)
+
+    layers: List[List[int]] = [[] for _ in range(max(ranks, default=-1) + 1)]
+    for i, rank in enumerate(ranks):
+        layers[rank].append(i)
+
+    # Order each rank by the mean position of its parents in the rank above,
+    # which keeps most edges short and uncrossed
+    order = [0.0] * len(nodes)
+
+    def barycenter(i: int) -> float:
+        above = [order[p] for p in parents[i] if ranks[p] < ranks[i]]
+        return sum(above) / len(above) if above else 0.0
+
+    for layer in layers:
+        # Stable, so roots keep their original order
+        layer.sort(key=barycenter)
+        for position, i in enumerate(layer):
+            order[i] = position
+
+    widths = [_label_width(node["label"]) for node in nodes]
+    layer_widths = [sum(widths[i] for i in layer) + NODE_SEP * (len(layer) - 1) for layer in layers]
+    graph_width = max(layer_widths, default=0)
+
+    for rank, layer in enumerate(layers):
+        # Centre every rank under the widest one
+        x = MARGIN + (graph_width - layer_widths[rank]) / 2
+        y = MARGIN + NODE_HEIGHT / 2 + rank * (NODE_HEIGHT + RANK_SEP)
+        for i in layer:
+            node = nodes[i]
+            node["w"] = widths[i]
+            node["h"] = NODE_HEIGHT
+            node["x"] = round(x + widths[i] / 2, 1)
+            node["y"] = y
+            x += widths[i] + NODE_SEP
+
+    for edge in edges:
+        source = nodes[edge["source"]]
+        target = nodes[edge["target"]]
+        if target["y"] > source["y"]:
+            # Bottom of the source to the top of the target
+            x1, y1 = source["x"], source["y"] + NODE_HEIGHT / 2
+            x2, y2 = target["x"], target["y"] - NODE_HEIGHT / 2
+            middle = (y1 + y2) / 2
+            edge["points"] = [[x1, y1], [x1, middle], [x2, middle], [x2, y2]]
+        else:
+            # Back edge of a cycle: loop round the right-hand sides
+            x1, y1 = source["x"] + source["w"] / 2, source["y"]
+            x2, y2 = target["x"] + target["w"] / 2, target["y"]
+            bulge = max(x1, x2) + NODE_SEP / 2
+            edge["points"] = [[x1, y1], [bulge, y1], [bulge, y2], [x2, y2]]
+
+    graph_height = len(layers) * (NODE_HEIGHT + RANK_SEP) - RANK_SEP if layers else 0
+    return round(graph_width) + 2 * MARGIN, graph_height + 2 * MARGIN
@@ -1,229 +1,306 @@
 import ast
 import inspect
 import os.path
-from typing import Dict, List, Any, Set, Optional, Tuple
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, List, Any, Set, Optional, Sequence, Tuple, Iterable
+
+from ._ast_cache import load_ast
+from ._fastwalk import fused_walk, walk_call_chain
+
+if TYPE_CHECKING:
+    from .scanner import RouteRec
+
+
+def code_location(func_obj) -> Optional[Tuple[str, int]]:
+    """Return (file, first line) from a function's code object, or None for non-functions."""
+    try:
+        func_obj = inspect.unwrap(func_obj)
+    except ValueError:
+        # Cyclic __wrapped__ chain
+        return None
+    code = getattr(func_obj, "__code__", None)
+    if code is None:
+        return None
+    # Like inspect.getsourcelines, co_firstlineno points at the first decorator line
+    return code.co_filename, code.co_firstlineno
 
-class FunctionCall(ast.NodeVisitor):
-    """AST visitor that finds function calls within a function."""
-    
-    def __init__(self):
-        self.calls = []
-        
-    def visit_Call(self, node):
-        """Visit a function call node."""
-        if isinstance(node.func, ast.Name):
-            # Direct function call like function_name()
-            self.calls.append(node.func.id)
-        elif isinstance(node.func, ast.Attribute):
-            # Method call like object.method()
-            self.calls.append(f"{self.get_attribute_chain(node.func)}")
-        
-        # Continue visiting child nodes
-        self.generic_visit(node)
-    
-    def get_attribute_chain(self, node):
-        """Get full attribute chain like a.b.c."""
-        if isinstance(node, ast.Attribute):
-            return f"{self.get_attribute_chain(node.value)}.{node.attr}"
-        elif isinstance(node, ast.Name):
-            return node.id
-        return "unknown"
+
+def _try_load_ast(source_file: str):
+    """Load a file into the AST cache, ignoring files that can't be parsed."""
+    try:
+        load_ast(source_file)
+    except Exception:
+        # analyze_function reports the error for the functions concerned
+        pass
+
+
+# Result for callables whose source file is unavailable
+_NO_SOURCE_FLOW = {"calls": (), "data_references": frozenset(), "db_operations": ()}
+
+
+# Node types _find_definition looks for, matched by exact type
+_DEFINITION_TYPES = frozenset((ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))
 
 
 class CodeFlowAnalyzer:
     """Analyzes code flow by tracking function calls and data flow."""
     
     def __init__(self):
-        self.call_graph = {}  # Maps function names to the functions they call
+        # Per-function analysis results, one dict per kind so each graph walk
+        # only touches the data it needs
+        self.calls_by_fn = {}     # Maps function names to the functions they call
+        self.datarefs_by_fn = {}  # Maps function names to the data they reference
+        self.dbops_by_fn = {}     # Maps function names to their database operations
         self.data_flow = {}   # Maps function names to data they access/modify
+        self._analysis_cache = weakref.WeakKeyDictionary()  # callable -> (source_file, flow_info)
+        self._lock = threading.Lock()  # Routes may be analyzed from several threads
+        self._clear_flow_caches()
+    
+    @property
+    def call_graph(self) -> Dict[str, Dict[str, Any]]:
+        """Per-function analysis results combined into one dict per function."""
+        return {
+            name: {
+                "calls": calls,
+                "data_references": self.datarefs_by_fn.get(name, frozenset()),
+                "db_operations": self.dbops_by_fn.get(name, ())
+            }
+            for name, calls in self.calls_by_fn.items()
+        }
+    
+    def prewarm(self, source_files: Iterable[str]):
+        """Parse source files concurrently so later analyze_function calls hit the AST cache."""
+        unique_files = {
+            f for f in source_files
+            if f and f != "Unknown" and os.path.exists(f)
+        }
+        if len(unique_files) < 2:
+            return
+        
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            list(executor.map(_try_load_ast, unique_files))
     
     def analyze_function(self, func_obj, source_file: str) -> Dict[str, Any]:
         """Analyze a function's code flow including called functions and data accesses."""
+        # Dependencies such as get_db are shared by many routes; analyze each
+        # callable only once per source file
+        with self._lock:
+            flow_info = self._cached_analysis(func_obj, source_file)
+        
+        if flow_info is None:
+            # Parse and walk outside the lock so threads analyze concurrently
+            flow_info = self._analyze(func_obj, source_file)
+            with self._lock:
+                # Another thread may have finished the same callable first
+                cached = self._cached_analysis(func_obj, source_file)
+                if cached is not None:
+                    flow_info = cached
+                else:
+                    try:
+                        self._analysis_cache[func_obj] = (source_file, flow_info)
+                    except TypeError:
+                        pass
+        
+        # Only successful analyses become part of the call graph
+        if flow_info is not _NO_SOURCE_FLOW and "error" not in flow_info:
+            with self._lock:
+                self._store_flow(func_obj.__name__, flow_info)
+        return flow_info
+    
+    def _cached_analysis(self, func_obj, source_file: str) -> Optional[Dict[str, Any]]:
+        """Return the cached analysis of a callable for this source file, if any."""
+        try:
+            cached = self._analysis_cache.get(func_obj)
+        except TypeError:
+            # Unhashable or not weakly referenceable callables are not cached
+            return None
+        if cached is not None and cached[0] == source_file:
+            return cached[1]
+        return None
+    
+    def _store_flow(self, name: str, flow_info: Dict[str, Any]):
+        """Record a function's analysis in the call graph."""
+        if self.calls_by_fn.get(name) is flow_info["calls"]:
+            return
+        self.calls_by_fn[name] = flow_info["calls"]
+        self.datarefs_by_fn[name] = flow_info["data_references"]
+        self.dbops_by_fn[name] = flow_info["db_operations"]
+        self._clear_flow_caches()
+    
+    def _analyze(self, func_obj, source_file: str) -> Dict[str, Any]:
+        """Analyze a single callable without consulting or updating any cache."""
         if not source_file or source_file == "Unknown" or not os.path.exists(source_file):
-            return {"calls": [], "data_references": [], "db_operations": []}
+            return _NO_SOURCE_FLOW
             
         try:
-            # Get function source
-            source_lines, start_line = inspect.getsourcelines(func_obj)
-            source_code = "".join(source_lines)
-            
-            # Parse the source code
-            tree = ast.parse(source_code)
-            
-            # Find all function calls
-            visitor = FunctionCall()
-            visitor.visit(tree)
+            # Locate the function inside the (cached) parse of its whole source file
+            location = code_location(func_obj)
+            start_line = location[1] if location else inspect.getsourcelines(func_obj)[1]
+            tree = self._find_definition(load_ast(source_file), func_obj.__name__, start_line)
+            if tree is None:
+                # Fall back to parsing the function source on its own
+                tree = ast.parse(inspect.getsource(func_obj))
             
-            # Analyze for database operations
-            db_operations = self.detect_database_operations(tree)
+            # Collect calls, database operations and data references in one pass
+            calls, db_operations, data_references = fused_walk(tree)
             
-            # Track data references
-            data_references = self.detect_data_references(tree)
-            
-            flow_info = {
-                "calls": visitor.calls,
-                "data_references": data_references,
-                "db_operations": db_operations
+            # Results are never mutated downstream, so freeze them
+            return {
+                "calls": tuple(calls),
+                "data_references": frozenset(data_references),
+                "db_operations": tuple(db_operations)
             }
             
-            # Store in call graph
-            self.call_graph[func_obj.__name__] = flow_info
-            
-            return flow_info
-            
         except Exception as e:
             # Return empty result if analysis fails
-            return {"calls": [], "data_references": [], "db_operations": [], "error": str(e)}
+            return {"calls": (), "data_references": frozenset(), "db_operations": (), "error": str(e)}
+    
+    def _find_definition(self, tree: ast.AST, name: str, start_line: int) -> Optional[ast.AST]:
+        """Find the function or class definition called `name` starting at `start_line`."""
+        stack = [tree]
+        while stack:
+            node = stack.pop()
+            if type(node) in _DEFINITION_TYPES and node.name == name:
+                # inspect reports the first decorator line as the start of the definition
+                first_line = min([node.lineno] + [d.lineno for d in node.decorator_list])
+                if first_line == start_line:
+                    return node
+            
+            # Only nodes spanning start_line can hold the definition, so whole
+            # functions and classes elsewhere in the module are skipped
+            for child in ast.iter_child_nodes(node):
+                end_line = getattr(child, "end_lineno", None)
+                if end_line is not None and end_line < start_line:
+                    continue
+                if getattr(child, "lineno", 0) > start_line and not getattr(child, "decorator_list", None):
+                    continue
+                stack.append(child)
+        return None
     
     def detect_database_operations(self, tree: ast.AST) -> List[Dict[str, Any]]:
         """Detect database operations in the AST."""
-        db_operations = []
-        
-        class DBOperationVisitor(ast.NodeVisitor):
-            def visit_Call(self, node):
-                # Common database operation patterns
-                
-                # SQLAlchemy: session.query(), session.add(), Model.query, etc.
-                if isinstance(node.func, ast.Attribute):
-                    attr_chain = self.get_attribute_chain(node.func)
-                    
-                    # SQLAlchemy patterns
-                    if any(pattern in attr_chain for pattern in [
-                        ".query", ".add", ".commit", ".delete", ".filter", 
-                        ".all", ".first", ".get", ".update", ".execute"
-                    ]):
-                        db_operations.append({
-                            "type": "sqlalchemy",
-                            "operation": attr_chain,
-                            "line": node.lineno
-                        })
-                    
-                    # Tortoise-ORM patterns
-                    elif any(pattern in attr_chain for pattern in [
-                        ".filter", ".get", ".create", ".delete", ".update", 
-                        ".all", ".first", ".save", ".values"
-                    ]):
-                        if attr_chain.startswith("Model") or "models." in attr_chain:
-                            db_operations.append({
-                                "type": "tortoise-orm",
-                                "operation": attr_chain,
-                                "line": node.lineno
-                            })
-                    
-                    # MongoDB with Motor or PyMongo
-                    elif any(pattern in attr_chain for pattern in [
-                        ".find", ".insert", ".update", ".delete", ".aggregate"
-                    ]):
-                        if "collection" in attr_chain or "db." in attr_chain:
-                            db_operations.append({
-                                "type": "mongodb",
-                                "operation": attr_chain,
-                                "line": node.lineno
-                            })
-                
-                # Continue visiting child nodes
-                self.generic_visit(node)
-            
-            def get_attribute_chain(self, node):
-                """Get full attribute chain like a.b.c."""
-                if isinstance(node, ast.Attribute):
-                    return f"{self.get_attribute_chain(node.value)}.{node.attr}"
-                elif isinstance(node, ast.Name):
-                    return node.id
-                return "unknown"
-        
-        db_visitor = DBOperationVisitor()
-        db_visitor.visit(tree)
-        
+        _, db_operations, _ = fused_walk(tree)
         return db_operations
     
-    def detect_data_references(self, tree: ast.AST) -> List[str]:
+    def detect_data_references(self, tree: ast.AST) -> Set[str]:
         """Detect data references (variables used) in the AST."""
-        data_refs = set()
-        
-        class VarRefVisitor(ast.NodeVisitor):
-            def visit_Name(self, node):
-                if isinstance(node.ctx, ast.Load):
-                    data_refs.add(node.id)
-                self.generic_visit(node)
-                
-            def visit_arg(self, node):
-                data_refs.add(node.arg)
-                self.generic_visit(node)
-        
-        var_visitor = VarRefVisitor()
-        var_visitor.visit(tree)
-        
-        return list(data_refs)
+        _, _, data_references = fused_walk(tree)
+        return data_references
     
-    def build_execution_flow(self, routes: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def build_execution_flow(self, routes: Sequence["RouteRec"]) -> Dict[str, Any]:
         """Build complete execution flow graph for each route."""
-        route_flows = {}
+        # The call graph is fixed for the duration of this build, so results
+        # can be shared between routes that reach the same functions
+        self._clear_flow_caches()
         
-        for route in routes:
-            endpoint_name = route["endpoint"]
-            route_flow = {
-                "endpoint": endpoint_name,
-                "path": route["path"],
-                "methods": route["methods"],
-                "call_chain": self.build_call_chain(endpoint_name),
-                "data_flow": self.trace_data_flow(endpoint_name),
-                "db_operations": self.extract_db_operations(endpoint_name)
+        # Bound methods hoisted out of the per-route loop
+        build_call_chain = self.build_call_chain
+        trace_data_flow = self.trace_data_flow
+        extract_db_operations = self.extract_db_operations
+        
+        return {
+            route.endpoint: {
+                "endpoint": route.endpoint,
+                "path": route.path,
+                "methods": route.methods,
+                "call_chain": build_call_chain(route.endpoint),
+                "data_flow": trace_data_flow(route.endpoint),
+                "db_operations": extract_db_operations(route.endpoint)
             }
-            route_flows[endpoint_name] = route_flow
-            
-        return route_flows
+            for route in routes
+        }
+    
+    def clear(self):
+        """Forget every analysis so functions are re-read from their current source."""
+        with self._lock:
+            self._analysis_cache = weakref.WeakKeyDictionary()
+            self.calls_by_fn = {}
+            self.datarefs_by_fn = {}
+            self.dbops_by_fn = {}
+            self.data_flow = {}
+            self._clear_flow_caches()
+    
+    def _clear_flow_caches(self):
+        """Reset the memoized call chain, data flow and DB operation results."""
+        self._call_chain_cache = {}
+        self._data_flow_cache = {}
+        self._db_ops_cache = {}
     
     def build_call_chain(self, func_name: str, visited: Set[str] = None) -> List[Dict[str, Any]]:
-        """Recursively build the chain of function calls."""
-        if visited is None:
-            visited = set()
-            
-        if func_name in visited:
-            return []  # Prevent cycles
-            
-        visited.add(func_name)
-        
-        if func_name not in self.call_graph:
-            return []
-            
-        call_chain = []
-        for called_func in self.call_graph[func_name].get("calls", []):
-            call_chain.append({
-                "function": called_func,
-                "calls": self.build_call_chain(called_func, visited.copy())
-            })
-            
-        return call_chain
+        """Build the nested chain of function calls made from a function."""
+        return walk_call_chain(self.calls_by_fn, func_name, self._call_chain_cache, visited if visited is not None else set())
     
-    def trace_data_flow(self, func_name: str) -> Dict[str, Any]:
+    def trace_data_flow(self, func_name: str, visited: Set[str] = None) -> Dict[str, Any]:
         """Trace how data flows through a function and its called functions."""
-        if func_name not in self.call_graph:
-            return {}
+        return self._trace_data_flow(func_name, set() if visited is None else visited)[0]
+    
+    def _trace_data_flow(self, func_name: str, visited: Set[str]) -> Tuple[Dict[str, Any], bool]:
+        """Trace data flow, also reporting whether no call was cut off as a cycle."""
+        if func_name in visited:
+            return {}, False
+        if func_name not in self.calls_by_fn:
+            return {}, True
+        
+        cached = self._data_flow_cache.get(func_name)
+        if cached is not None:
+            return cached, True
             
         # Get data references for this function
-        data_refs = self.call_graph[func_name].get("data_references", [])
+        data_refs = self.datarefs_by_fn.get(func_name, frozenset())
         
         # Get data flows for called functions
+        complete = True
         called_funcs_data = {}
-        for called_func in self.call_graph[func_name].get("calls", []):
-            called_funcs_data[called_func] = self.trace_data_flow(called_func)
+        visited.add(func_name)
+        try:
+            for called_func in self.calls_by_fn[func_name]:
+                called_funcs_data[called_func], called_complete = self._trace_data_flow(called_func, visited)
+                complete = complete and called_complete
+        finally:
+            visited.discard(func_name)
             
-        return {
+        data_flow = {
             "references": data_refs,
             "called_functions": called_funcs_data
         }
+        # A result with a cycle cut off depends on the path it was reached
+        # by, so only complete results are shared between routes
+        if complete:
+            self._data_flow_cache[func_name] = data_flow
+        return data_flow, complete
     
-    def extract_db_operations(self, func_name: str) -> List[Dict[str, Any]]:
+    def extract_db_operations(self, func_name: str, visited: Set[str] = None) -> List[Dict[str, Any]]:
         """Extract database operations from a function and its called functions."""
-        if func_name not in self.call_graph:
-            return []
+        return self._extract_db_operations(func_name, set() if visited is None else visited)[0]
+    
+    def _extract_db_operations(self, func_name: str, visited: Set[str]) -> Tuple[List[Dict[str, Any]], bool]:
+        """Extract DB operations, also reporting whether no call was cut off as a cycle."""
+        if func_name in visited:
+            return [], False
+        if func_name not in self.calls_by_fn:
+            return [], True
+        
+        cached = self._db_ops_cache.get(func_name)
+        if cached is not None:
+            return cached, True
             
-        # Get direct DB operations
-        db_ops = self.call_graph[func_name].get("db_operations", [])
+        # Get direct DB operations (copied so the stored call graph is left untouched)
+        db_ops = list(self.dbops_by_fn.get(func_name, ()))
         
         # Get DB operations from called functions
-        for called_func in self.call_graph[func_name].get("calls", []):
-            db_ops.extend(self.extract_db_operations(called_func))
+        complete = True
+        visited.add(func_name)
+        try:
+            for called_func in self.calls_by_fn[func_name]:
+                called_ops, called_complete = self._extract_db_operations(called_func, visited)
+                db_ops.extend(called_ops)
+                complete = complete and called_complete
+        finally:
+            visited.discard(func_name)
             
-        return db_ops
+        # Only complete results are path independent and safe to share
+        if complete:
+            self._db_ops_cache[func_name] = db_ops
+        return db_ops, complete
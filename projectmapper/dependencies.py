@@ -1,27 +1,30 @@
 import inspect
-from typing import Dict, List, Any, Set
+from typing import TYPE_CHECKING, Dict, List, Any, Sequence, Set
+
+if TYPE_CHECKING:
+    from .scanner import RouteRec
 
 
 class DependencyAnalyzer:
     def __init__(self):
         self.dependency_graph = {}
         
-    def analyze_dependencies(self, routes: List[Dict[str, Any]]) -> Dict[str, List[str]]:
+    def analyze_dependencies(self, routes: Sequence["RouteRec"]) -> Dict[str, List[str]]:
         """Analyze dependencies between routes and functions."""
         # Create a graph of dependencies
         for route in routes:
-            endpoint = route["endpoint"]
+            endpoint = route.endpoint
             if endpoint not in self.dependency_graph:
                 self.dependency_graph[endpoint] = []
             
             # Add direct dependencies from route
-            for dep in route["dependencies"]:
+            for dep in route.dependencies:
                 dep_name = dep.get("name", "unknown")
                 if dep_name not in self.dependency_graph[endpoint]:
                     self.dependency_graph[endpoint].append(dep_name)
             
             # Try to analyze function parameters for Depends
-            self._analyze_function_depends(route["endpoint"], route["source_file"])
+            self._analyze_function_depends(endpoint, route.source_file)
         
         return self.dependency_graph
     
@@ -1,13 +1,38 @@
-import inspect
-from typing import Any, Dict, List, Optional, Set, Type, Callable
-import fastapi
-from fastapi import APIRouter, Depends, FastAPI
-from pydantic import BaseModel
+import gzip
+import hashlib
+from typing import Any, Dict, Callable, Optional, Tuple, Type
+from fastapi import FastAPI, Request
+from fastapi.responses import HTMLResponse, Response
 
-from .scanner import RouteScanner
+from .scanner import RouteScanner, index_routes
 from .models import ModelAnalyzer
-from .visualization import generate_html_visualization, generate_data_flow_visualization
+from .visualization import generate_html_visualization, generate_graph_data, generate_data_flow_visualization
 from .dependencies import DependencyAnalyzer
+from ._json import dumps
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an Accept-Encoding header allows a gzip body; ``q=0`` refuses it."""
+    wildcard = None
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if coding not in ("gzip", "x-gzip", "*"):
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding == "*":
+            wildcard = quality > 0
+        else:
+            # An explicit gzip entry overrides the wildcard
+            return quality > 0
+    return bool(wildcard)
 
 
 class ProjectMapper:
@@ -25,6 +50,7 @@ class ProjectMapper:
         self.model_analyzer = ModelAnalyzer()
         self.dependency_analyzer = DependencyAnalyzer()
         self._initialized = False
+        self.invalidate()
         
     def initialize(self):
         """Initialize the project mapper, analyzing the FastAPI application structure."""
@@ -33,57 +59,177 @@ class ProjectMapper:
             
         # Add a route to the FastAPI app to view the project map
         @self.app.get(f"{self.base_path}/json", include_in_schema=False)
-        async def view_project_map():
-            return self.generate_map()
+        async def view_project_map(request: Request):
+            return self._cached_response(
+                request, "map_json", lambda: dumps(self.generate_map()), Response, "application/json"
+            )
         
         # Add a route to view the project visualization
         @self.app.get(f"{self.base_path}/html", include_in_schema=False)
-        async def view_project_visualization():
-            from fastapi.responses import HTMLResponse
-            return HTMLResponse(content=self.generate_visualization(), status_code=200)
+        async def view_project_visualization(request: Request):
+            # The page fetches its graph from the content-addressed route below,
+            # so browsers keep the (large) graph cached across page loads
+            return self._cached_response(
+                request,
+                "map_html",
+                lambda: generate_html_visualization(self.generate_map(), graph_url=self._graph_url()).encode("utf-8"),
+                HTMLResponse
+            )
+        
+        # Add a route serving the graph drawn by the visualization
+        @self.app.get(f"{self.base_path}/graph/{{digest}}.json", include_in_schema=False)
+        async def view_project_graph(request: Request, digest: str):
+            if digest != self._graph_asset()[1]:
+                # Requested by a page built before the application changed
+                return Response(status_code=404)
+            return self._cached_response(
+                request,
+                "graph_json",
+                lambda: self._graph_asset()[0],
+                Response,
+                "application/json",
+                cache_control="private, max-age=31536000, immutable"
+            )
         
         # Add a route for data flow analysis
         @self.app.get(f"{self.base_path}/dataflow/json", include_in_schema=False)
-        async def view_data_flow():
-            return self.generate_data_flow_map()
+        async def view_data_flow(request: Request):
+            return self._cached_response(
+                request, "data_flow_json", lambda: dumps(self.generate_data_flow_map()), Response, "application/json"
+            )
             
         # Add a route for data flow visualization
         @self.app.get(f"{self.base_path}/dataflow/html", include_in_schema=False)
-        async def view_data_flow_visualization():
-            from fastapi.responses import HTMLResponse
-            return HTMLResponse(content=self.generate_data_flow_visualization(), status_code=200)
+        async def view_data_flow_visualization(request: Request):
+            return self._cached_response(
+                request, "data_flow_html", lambda: self.generate_data_flow_visualization().encode("utf-8"), HTMLResponse
+            )
         
         self._initialized = True
         
+    def invalidate(self):
+        """Drop cached maps so the next request re-analyzes the application."""
+        self._cache_key = None
+        self._map_cache = None
+        self._routes_index = None
+        self._visualization_cache = None
+        self._data_flow_cache = None
+        self._data_flow_visualization_cache = None
+        self._graph_cache = None  # (body, digest) of the visualization's graph
+        self._response_cache = {}  # (body, etag) per endpoint and content encoding
+        # Per-function analyses are kept across scans; drop them too so edited
+        # source is picked up
+        self.route_scanner.flow_analyzer.clear()
+    
+    def _cached_response(
+        self,
+        request: Request,
+        name: str,
+        build: Callable[[], bytes],
+        response_class: Type[Response],
+        media_type: Optional[str] = None,
+        cache_control: str = "private, max-age=0"
+    ) -> Response:
+        """
+        Serve an endpoint body that is built only once per cache key.
+        
+        The body is tagged with an ETag derived from its content, so clients
+        revalidating an unchanged map get an empty 304 response. Clients that
+        accept gzip get a body compressed once and cached alongside it.
+        """
+        self._refresh_cache()
+        cached = self._response_cache.get(name)
+        if cached is None:
+            content = build()
+            etag = f'"{hashlib.blake2b(content, digest_size=8).hexdigest()}"'
+            cached = self._response_cache[name] = {"identity": (content, etag)}
+        
+        # The JSON embedded in the pages is highly repetitive, so compress it
+        # once for all clients that accept gzip
+        encoding = "gzip" if _accepts_gzip(request.headers.get("accept-encoding", "")) else "identity"
+        if encoding not in cached:
+            content, etag = cached["identity"]
+            cached[encoding] = (gzip.compress(content, compresslevel=6), f'{etag[:-1]}-gzip"')
+        content, etag = cached[encoding]
+        
+        if_none_match = request.headers.get("if-none-match", "")
+        if etag in (tag.strip() for tag in if_none_match.split(",")):
+            return Response(status_code=304, headers={"ETag": etag, "Vary": "Accept-Encoding"})
+        
+        headers = {"ETag": etag, "Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+        if encoding == "gzip":
+            headers["Content-Encoding"] = "gzip"
+        return response_class(content=content, media_type=media_type, headers=headers)
+    
+    def _graph_asset(self) -> Tuple[bytes, str]:
+        """Return the serialized visualization graph and its content digest."""
+        self._refresh_cache()
+        if self._graph_cache is None:
+            content = dumps(generate_graph_data(self.generate_map()))
+            self._graph_cache = (content, hashlib.blake2b(content, digest_size=8).hexdigest())
+        return self._graph_cache
+    
+    def _graph_url(self) -> str:
+        """URL of the visualization graph; it changes whenever the graph does."""
+        # Relative to the page at {base_path}/html, so it still resolves when the
+        # app is mounted under a prefix or served behind a proxy
+        return f"graph/{self._graph_asset()[1]}.json"
+    
+    def _refresh_cache(self):
+        """Invalidate cached results if the application's routes have changed."""
+        # Routes are only added at startup or via include_router, both of which
+        # change the route count
+        key = (len(self.app.routes), id(self.app.router))
+        if key != self._cache_key:
+            self.invalidate()
+            self._cache_key = key
+        
     def generate_map(self) -> Dict[str, Any]:
         """Generate a structured map of the project."""
+        self._refresh_cache()
+        if self._map_cache is not None:
+            return self._map_cache
+        
         routes = self.route_scanner.scan_routes()
-        models = self.model_analyzer.extract_models_from_routes(routes)
-        dependencies = self.dependency_analyzer.analyze_dependencies(routes)
+        routes_idx = self._routes_index = index_routes(routes)
+        models = self.model_analyzer.extract_models_from_routes(routes_idx)
+        dependencies = self.dependency_analyzer.analyze_dependencies(routes_idx)
         
-        return {
+        self._map_cache = {
             "routes": routes,
             "models": models,
             "dependencies": dependencies
         }
+        return self._map_cache
     
     def generate_data_flow_map(self) -> Dict[str, Any]:
         """Generate a structured map of the project's data flow."""
-        data_flow = self.route_scanner.get_data_flow_analysis()
-        return {
+        self._refresh_cache()
+        if self._data_flow_cache is not None:
+            return self._data_flow_cache
+        
+        # Reuse the routes scanned for the project map rather than scanning again
+        self.generate_map()
+        data_flow = self.route_scanner.get_data_flow_analysis(self._routes_index)
+        self._data_flow_cache = {
             "data_flow": data_flow
         }
+        return self._data_flow_cache
     
     def generate_visualization(self) -> str:
         """Generate HTML visualization of the project map."""
-        project_map = self.generate_map()
-        return generate_html_visualization(project_map)
+        self._refresh_cache()
+        if self._visualization_cache is None:
+            self._visualization_cache = generate_html_visualization(self.generate_map())
+        return self._visualization_cache
     
     def generate_data_flow_visualization(self) -> str:
         """Generate HTML visualization of the data flow."""
-        data_flow_map = self.generate_data_flow_map()
-        return generate_data_flow_visualization(data_flow_map)
-
+        self._refresh_cache()
+        if self._data_flow_visualization_cache is None:
+            data_flow_map = self.generate_data_flow_map()
+            self._data_flow_visualization_cache = generate_data_flow_visualization(data_flow_map)
+        return self._data_flow_visualization_cache
 
 def map_project(app: FastAPI, base_path: str = "/_project") -> ProjectMapper:
     """
@@ -1,16 +1,50 @@
-import inspect
+import functools
 import sys
 import os
-from typing import Dict, List, Any, Type, Set, Optional
+import re
+from collections import namedtuple
+from typing import TYPE_CHECKING, Dict, List, Any, Type, Set, Optional, Sequence, Tuple
+import pydantic
 from pydantic import BaseModel
 
+if TYPE_CHECKING:
+    from .scanner import RouteRec
+
+
+# Common external libraries whose modules are never part of the project
+_EXTERNAL_MODULE_PREFIXES = (
+    'openai', 'numpy', 'pandas', 'tensorflow', 'torch', 'sklearn',
+    'matplotlib', 'requests', 'boto3', 'flask', 'django', 'fastapi.',
+    'pydantic.', 'starlette', 'sqlalchemy', 'pytest'
+)
+
+_IDENT_RE = re.compile(r"\b[A-Z][A-Za-z0-9_]*")
+
+# Capitalized names from typing annotations that are never project models
+_TYPING_NOISE = frozenset({
+    "List", "Dict", "Optional", "Union", "Tuple", "Set", "FrozenSet", "Any",
+    "Annotated", "Literal", "Sequence", "Mapping", "Iterable", "Type", "Callable",
+    "None", "True", "False"
+})
+
+# One model field; converted to a JSON object only when the map is serialized
+Field = namedtuple("Field", "name type required default")
+
+# Field metadata lives in different places in Pydantic v1 and v2; decided once at import
+_PYDANTIC_V2 = str(getattr(pydantic, "VERSION", "")).startswith("2")
+
 
 class ModelAnalyzer:
     def __init__(self, project_root: Optional[str] = None):
-        self.discovered_models = set()
+        self.discovered_models: Set[int] = set()  # id() of each model reported
         self.project_root = project_root
+        # Resolved once, with a trailing separator so "/app2" doesn't match "/app"
+        self._project_prefix = (
+            os.path.join(os.path.realpath(project_root), "") if project_root else None
+        )
+        self._is_project_cache: Dict[int, bool] = {}
         
-    def extract_models_from_routes(self, routes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def extract_models_from_routes(self, routes: Sequence["RouteRec"]) -> List[Dict[str, Any]]:
         """Extract Pydantic models from route parameters and responses."""
         # First, collect all potential model references
         model_references = set()
@@ -18,40 +52,48 @@ class ModelAnalyzer:
         # Check route parameters and response models
         for route in routes:
             # Check response model
-            if route["response_model"]:
-                self._add_model_from_string(route["response_model"], model_references)
+            if route.response_model:
+                self._add_model_from_string(route.response_model, model_references)
             
             # Check parameters for potential models
-            for param in route["parameters"]:
+            for param in route.parameters:
                 self._add_model_from_string(param["annotation"], model_references)
         
+        # Typing constructs are not models, drop them before the class lookup
+        model_references -= _TYPING_NOISE
+        
         # Now analyze the actual models
         return self._analyze_models(model_references)
     
     def _add_model_from_string(self, type_str: str, model_references: Set[str]):
         """Parse a type string and add potential model references."""
-        # This is a simplified version; a more robust parser would be needed
-        # for complex type annotations
-        for potential_model in type_str.split(','):
-            # Clean up the string
-            model_name = potential_model.strip().split('[')[0].split('.')[-1]
-            if model_name:
-                model_references.add(model_name)
+        # Annotations arrive as str() of the type, e.g. "<class 'app.Item'>" or
+        # "typing.Dict[str, typing.List[app.Item]]"; every capitalized
+        # identifier is a candidate class name, at any nesting depth
+        model_references.update(_IDENT_RE.findall(type_str))
     
     def _is_project_module(self, module) -> bool:
         """Check if a module is part of the project."""
+        # Modules are long-lived and their location never changes, so the
+        # answer is computed once per module object
+        key = id(module)
+        cached = self._is_project_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        result = self._check_project_module(module)
+        self._is_project_cache[key] = result
+        return result
+    
+    def _check_project_module(self, module) -> bool:
+        """Decide whether a module belongs to the project, without caching."""
         # Skip known problematic modules and packages
         if hasattr(module, "__name__"):
-            module_name = module.__name__
             # Skip OpenAI modules and other common external libraries
-            if any(module_name.startswith(prefix) for prefix in [
-                'openai', 'numpy', 'pandas', 'tensorflow', 'torch', 'sklearn', 
-                'matplotlib', 'requests', 'boto3', 'flask', 'django', 'fastapi.', 
-                'pydantic.', 'starlette', 'sqlalchemy', 'pytest'
-            ]):
+            if module.__name__.startswith(_EXTERNAL_MODULE_PREFIXES):
                 return False
         
-        if not self.project_root:
+        if not self._project_prefix:
             # If project_root is not specified, we'll consider internal modules only
             return not (hasattr(module, '__file__') and 
                       (module.__file__ is None or 
@@ -62,13 +104,9 @@ class ModelAnalyzer:
             if not hasattr(module, '__file__') or module.__file__ is None:
                 return False
                 
-            # Get normalized absolute paths
-            module_path = os.path.normpath(os.path.abspath(module.__file__))
-            project_path = os.path.normpath(os.path.abspath(self.project_root))
-            
-            # Simple path prefix check
-            return module_path.startswith(project_path)
-        except Exception:
+            # Simple path prefix check on the resolved module path
+            return os.path.realpath(module.__file__).startswith(self._project_prefix)
+        except (TypeError, ValueError):
             # If we can't determine the module's file, treat it as external
             return False
     
@@ -76,65 +114,87 @@ class ModelAnalyzer:
         """Analyze models found in the project."""
         models = []
         
-        # Create a copy of sys.modules to prevent "dictionary changed size during iteration" error
-        modules_items = list(sys.modules.items())
+        # Models found by an earlier call must be reported again, not skipped
+        self.discovered_models.clear()
         
-        # Find all Pydantic models in loaded modules
-        for module_name, module in modules_items:
-            # Skip modules with underscore prefix and empty modules
-            if module_name.startswith('_') or not module:
+        # Pydantic tracks every loaded model through the subclass registry, so
+        # walk that rather than probing the attributes of every loaded module,
+        # and only look at classes whose name a route actually references
+        for obj in _all_subclasses(BaseModel):
+            if obj.__name__ not in model_references:
                 continue
-                
-            # Skip external modules/dependencies earlier in the process
-            if not self._is_project_module(module):
+            
+            # Skip if we've already processed this model
+            if id(obj) in self.discovered_models:
+                continue
+            
+            # Skip models from private modules and external dependencies
+            module_name = getattr(obj, "__module__", None)
+            if not module_name or module_name.startswith('_'):
+                continue
+            module = sys.modules.get(module_name)
+            if module is None or not self._is_project_module(module):
                 continue
             
             try:
-                # Define a safe get_members function to avoid problematic attribute access
-                def safe_getmembers(module):
-                    try:
-                        # Only return members that can be accessed without triggering lazy loading
-                        for name in dir(module):
-                            try:
-                                obj = getattr(module, name)
-                                yield name, obj
-                            except (AttributeError, ImportError, Exception):
-                                continue
-                    except Exception:
-                        return []
-                
-                for name, obj in safe_getmembers(module):
-                    try:
-                        if (inspect.isclass(obj) and issubclass(obj, BaseModel) and 
-                            obj.__module__ == module.__name__ and 
-                            obj != BaseModel):
-                            
-                            # Skip if we've already processed this model
-                            if obj in self.discovered_models:
-                                continue
-                                
-                            self.discovered_models.add(obj)
-                            
-                            # Extract model fields
-                            fields = []
-                            for field_name, field_info in obj.__fields__.items():
-                                fields.append({
-                                    "name": field_name,
-                                    "type": str(field_info.outer_type_),
-                                    "required": field_info.required,
-                                    "default": str(field_info.default) if not field_info.required else None
-                                })
-                            
-                            models.append({
-                                "name": obj.__name__,
-                                "module": obj.__module__,
-                                "fields": fields
-                            })
-                    except (TypeError, AttributeError, Exception):
-                        # Skip any class that can't be properly analyzed
-                        continue
-            except Exception:
-                # Skip any modules that can't be inspected
+                # Extract model fields
+                fields = _describe_model(obj)
+            except (TypeError, AttributeError):
+                # Skip classes that don't expose Pydantic's field metadata
                 continue
+            
+            self.discovered_models.add(id(obj))
+            models.append({
+                "name": obj.__name__,
+                "module": obj.__module__,
+                "fields": fields
+            })
         
         return models
+
+
+def _describe_model_v2(cls: Type[BaseModel]) -> Tuple[Field, ...]:
+    """Describe the fields of a Pydantic v2 model."""
+    fields = []
+    for field_name, field_info in cls.model_fields.items():
+        required = field_info.is_required()
+        fields.append(Field(
+            field_name,
+            str(field_info.annotation),
+            required,
+            None if required else str(field_info.default)
+        ))
+    return tuple(fields)
+
+
+def _describe_model_v1(cls: Type[BaseModel]) -> Tuple[Field, ...]:
+    """Describe the fields of a Pydantic v1 model."""
+    return tuple(
+        Field(
+            field_name,
+            str(field_info.outer_type_),
+            field_info.required,
+            str(field_info.default) if not field_info.required else None
+        )
+        for field_name, field_info in cls.__fields__.items()
+    )
+
+
+# Cached since model classes don't change at runtime
+_describe_model = functools.lru_cache(maxsize=None)(
+    _describe_model_v2 if _PYDANTIC_V2 else _describe_model_v1
+)
+
+
+def _all_subclasses(cls: Type) -> List[Type]:
+    """Return all direct and indirect subclasses of a class."""
+    seen = set()
+    result = []
+    stack = [cls]
+    while stack:
+        for subclass in stack.pop().__subclasses__():
+            if subclass not in seen:
+                seen.add(subclass)
+                result.append(subclass)
+                stack.append(subclass)
+    return result
@@ -1,71 +1,177 @@
+import functools
 import inspect
-from typing import Dict, List, Any, Callable, Set
+import os
+import weakref
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Callable, Optional, Sequence, Set, Tuple
 from fastapi import FastAPI, APIRouter, Depends
 from fastapi.routing import APIRoute
-from .codeflow import CodeFlowAnalyzer
+from .codeflow import CodeFlowAnalyzer, code_location
+
+
+# Parameter sentinels hoisted out of the per-route loop
+_EMPTY = inspect.Parameter.empty
+_SKIP_PARAMS = frozenset(("self", "cls"))
+
+# Compact, read-only view of the route fields the analyzers consume
+RouteRec = namedtuple("RouteRec", "endpoint path methods dependencies source_file response_model parameters")
+
+
+def index_routes(routes: List[Dict[str, Any]]) -> Tuple[RouteRec, ...]:
+    """Build the analyzer input index from scanned route dicts, once per scan."""
+    return tuple(
+        RouteRec(
+            route["endpoint"], route["path"], route["methods"], route["dependencies"],
+            route["source_file"], route["response_model"], route["parameters"]
+        )
+        for route in routes
+    )
+
+
+def _per_callable_cache(func: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    """Memoize a pure introspection helper per callable, without keeping callables alive."""
+    # Safe to share between scanner threads: at worst two threads compute the
+    # same (pure) result and one write wins
+    cache = weakref.WeakKeyDictionary()
+    
+    @functools.wraps(func)
+    def wrapper(fn):
+        try:
+            return cache[fn]
+        except KeyError:
+            pass
+        except TypeError:
+            # Unhashable or not weakly referenceable callables are not cached
+            return func(fn)
+        result = func(fn)
+        try:
+            cache[fn] = result
+        except TypeError:
+            pass
+        return result
+    
+    return wrapper
+
+
+_cached_signature = _per_callable_cache(inspect.signature)
+_cached_getdoc = _per_callable_cache(inspect.getdoc)
+
+
+@_per_callable_cache
+def _cached_signature_str(fn: Callable) -> str:
+    """Return the formatted signature of a callable."""
+    return str(_cached_signature(fn))
+
+
+def _source_file(fn: Callable) -> str:
+    """Return the file a callable is defined in, or "Unknown"."""
+    return _source_location(fn)[0]
+
+
+@_per_callable_cache
+def _source_location(fn: Callable) -> Tuple[str, int]:
+    """Return the file and first line of a callable, or ("Unknown", 0)."""
+    # Plain functions answer from their code object, no source tokenizing needed
+    location = code_location(fn)
+    if location is not None:
+        return location
+    try:
+        source_file = inspect.getfile(fn)
+    except (TypeError, OSError):
+        return "Unknown", 0
+    try:
+        return source_file, inspect.getsourcelines(fn)[1]
+    except (TypeError, OSError):
+        return source_file, 0
 
 
 class RouteScanner:
-    def __init__(self, app: FastAPI):
+    def __init__(self, app: FastAPI, include_signature_str: bool = True):
         self.app = app
+        # Formatting a signature walks every parameter; callers that only use
+        # the structured "parameters" can turn it off
+        self.include_signature_str = include_signature_str
         self.flow_analyzer = CodeFlowAnalyzer()
         
     def scan_routes(self) -> List[Dict[str, Any]]:
         """Scan all routes in the FastAPI application."""
-        routes = []
-        self._process_routes(self.app.routes, routes)
-        return routes
+        flat_routes = []
+        self._process_routes(self.app.routes, flat_routes)
+        
+        # Parse all endpoint and dependency source files up front, in parallel
+        self.flow_analyzer.prewarm(self._collect_source_files(flat_routes))
+        
+        if len(flat_routes) < 2:
+            return [self._extract_route_info(route, prefix) for route, prefix in flat_routes]
+        
+        # Routes are independent; map() keeps the results in route order
+        max_workers = min(32, (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(lambda item: self._extract_route_info(*item), flat_routes))
+    
+    def _collect_source_files(self, flat_routes: List[Tuple[APIRoute, str]]) -> Set[str]:
+        """Collect the source files of all endpoints and route dependencies."""
+        source_files = set()
+        for route, _ in flat_routes:
+            source_files.add(_source_file(route.endpoint))
+            for dep in getattr(route, "dependencies", None) or ():
+                dependency_callable = getattr(dep, "dependency", None)
+                if dependency_callable is not None:
+                    source_files.add(_source_file(dependency_callable))
+        return source_files
     
-    def _process_routes(self, app_routes: List[Any], results: List[Dict[str, Any]], prefix: str = ""):
-        """Process routes and nested routers."""
+    def _process_routes(self, app_routes: List[Any], results: List[Tuple[APIRoute, str]], prefix: str = ""):
+        """Flatten routes and nested routers into (route, prefix) pairs."""
         for route in app_routes:
             if isinstance(route, APIRoute):
-                route_info = self._extract_route_info(route, prefix)
-                results.append(route_info)
+                results.append((route, prefix))
+                continue
             
             # Handle mounted APIRouters
-            elif hasattr(route, "routes"):
-                router_prefix = prefix + (route.prefix if hasattr(route, "prefix") else "")
-                self._process_routes(route.routes, results, router_prefix)
+            sub_routes = getattr(route, "routes", None)
+            if sub_routes is not None:
+                router_prefix = prefix + getattr(route, "prefix", "")
+                self._process_routes(sub_routes, results, router_prefix)
     
     def _extract_route_info(self, route: APIRoute, prefix: str = "") -> Dict[str, Any]:
         """Extract information from a single route."""
         path = prefix + route.path
         endpoint_func = route.endpoint
         
+        methods = sorted(route.methods or ())
+        
         # Get dependencies
-        dependencies = []
-        if hasattr(route, "dependencies"):
-            dependencies = self._extract_dependencies(route.dependencies)
+        route_dependencies = getattr(route, "dependencies", None)
+        dependencies = self._extract_dependencies(route_dependencies) if route_dependencies else []
         
-        # Get endpoint signature and docstring
-        signature = str(inspect.signature(endpoint_func))
-        docstring = inspect.getdoc(endpoint_func) or ""
+        # Get endpoint signature and docstring (introspected once per endpoint)
+        sig = _cached_signature(endpoint_func)
+        signature = _cached_signature_str(endpoint_func) if self.include_signature_str else None
+        docstring = _cached_getdoc(endpoint_func) or ""
         
         # Get source file and line number
-        try:
-            source_file = inspect.getfile(endpoint_func)
-            source_line = inspect.getsourcelines(endpoint_func)[1]
-        except (TypeError, OSError):
-            source_file = "Unknown"
-            source_line = 0
+        source_file, source_line = _source_location(endpoint_func)
         
         # Extract function parameters that might be models
         parameters = []
-        for param_name, param in inspect.signature(endpoint_func).parameters.items():
-            if param_name != "self" and param_name != "cls":
-                parameters.append({
-                    "name": param_name,
-                    "annotation": str(param.annotation),
-                    "default": str(param.default) if param.default is not inspect.Parameter.empty else None
-                })
+        for param_name, param in sig.parameters.items():
+            if param_name in _SKIP_PARAMS:
+                continue
+            default = param.default
+            parameters.append({
+                "name": param_name,
+                "annotation": str(param.annotation),
+                "default": None if default is _EMPTY else str(default)
+            })
         
         # Analyze code flow
         code_flow = self.flow_analyzer.analyze_function(endpoint_func, source_file)
         
         return {
             "path": path,
-            "methods": route.methods,
+            "methods": methods,
+            "methods_lower": tuple(method.lower() for method in methods),
             "name": route.name,
             "endpoint": endpoint_func.__name__,
             "signature": signature,
@@ -82,25 +188,24 @@ class RouteScanner:
         """Extract information about dependencies."""
         results = []
         for dep in dependencies:
-            if hasattr(dep, "dependency"):
-                dependency_callable = dep.dependency
+            dependency_callable = getattr(dep, "dependency", None)
+            if dependency_callable is not None:
                 
                 # Get source file for dependency
-                try:
-                    source_file = inspect.getfile(dependency_callable)
-                except (TypeError, OSError):
-                    source_file = "Unknown"
+                source_file = _source_file(dependency_callable)
                 
                 # Analyze dependency code flow
                 code_flow = self.flow_analyzer.analyze_function(dependency_callable, source_file)
                 
                 results.append({
-                    "name": dependency_callable.__name__ if hasattr(dependency_callable, "__name__") else str(dependency_callable),
+                    "name": getattr(dependency_callable, "__name__", None) or str(dependency_callable),
                     "callable": str(dependency_callable),
                     "code_flow": code_flow
                 })
         return results
     
-    def get_data_flow_analysis(self) -> Dict[str, Any]:
-        """Get complete data flow analysis for all routes."""
-        return self.flow_analyzer.build_execution_flow(self.scan_routes())
+    def get_data_flow_analysis(self, routes: Optional[Sequence[RouteRec]] = None) -> Dict[str, Any]:
+        """Get complete data flow analysis for all routes, scanning them unless already indexed."""
+        if routes is None:
+            routes = index_routes(self.scan_routes())
+        return self.flow_analyzer.build_execution_flow(routes)
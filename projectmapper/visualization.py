@@ -1,69 +1,242 @@
-import json
-from typing import Dict, Any, List
+import functools
+import html
+import re
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from collections import defaultdict
+from collections.abc import Mapping
 
+from ._json import dumps_str
+from ._layout import layout_graph
 
-class SetEncoder(json.JSONEncoder):
-    """Custom JSON encoder that converts sets to lists."""
-    def default(self, obj):
-        if isinstance(obj, set):
-            return list(obj)
-        return json.JSONEncoder.default(self, obj)
+# Identifiers inside a type string, candidate model names for graph links
+_TYPE_IDENT_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
 
 
-def generate_html_visualization(project_map: Dict[str, Any]) -> str:
-    """Generate an HTML visualization of the project map."""
+def _script_json(obj: Any) -> str:
+    """Serialize data for embedding inside an inline <script> block."""
+    # "</" would let a docstring or path close the surrounding script tag
+    return dumps_str(obj).replace("</", "<\\/")
+
+
+@functools.lru_cache(maxsize=8192)
+def _esc(value: str) -> str:
+    """HTML-escape a value; memoized since module, endpoint and type names recur."""
+    return html.escape(value, quote=True)
+
+
+# Row templates for the static HTML sections, parsed once and filled via format_map
+_ROUTE_GROUP_OPEN_TMPL = """
+        <div class="route-group" id="group-{group_id}">
+            <div class="route-group-header">{prefix} ({count} routes)</div>
+            <div class="route-group-content">
+        """.format_map
+_ROUTE_GROUP_CLOSE = """
+            </div>
+        </div>
+        """
+_ROUTE_TMPL = """
+            <div class="route">
+                <h3>{methods_html} {path}</h3>
+                <p><strong>Handler:</strong> {endpoint}</p>
+                <p><strong>Signature:</strong> {signature}</p>
+                <p><strong>Source:</strong> {source_file}:{source_line}</p>
+                <p><strong>Response Model:</strong> {response_model}</p>
+                <p><strong>Dependencies:</strong> {deps}</p>
+                <p><strong>Description:</strong> {docstring}</p>
+            </div>
+            """.format_map
+_METHOD_TMPL = '<span class="method {method_lower}">{method}</span>'.format
+_MODEL_TMPL = """
+        <div class="model">
+            <h3>{name}</h3>
+            <p><strong>Module:</strong> {module}</p>
+            <h4>Fields:</h4>
+            <ul>
+                {fields_html}
+            </ul>
+        </div>
+        """.format_map
+_FIELD_TMPL = '<li><strong>{name}</strong>: {type} ({required})</li>'.format
+_DEPENDENCY_TMPL = """
+        <div class="dependency">
+            <h3>{endpoint}</h3>
+            <h4>Depends on:</h4>
+            {deps_html}
+        </div>
+        """.format_map
+
+
+def iter_html_visualization(project_map: Dict[str, Any], graph_url: Optional[str] = None) -> Iterator[str]:
+    """Yield the HTML visualization of the project map in chunks, e.g. for a StreamingResponse."""
+    return _iter_html_page(project_map, graph_url)
+
+def generate_html_visualization(project_map: Dict[str, Any], graph_url: Optional[str] = None) -> str:
+    """Generate an HTML visualization of the project map.
+    
+    With ``graph_url`` the page fetches the graph (see ``generate_graph_data``)
+    from that URL instead of embedding it.
+    """
+    return "".join(_iter_html_page(project_map, graph_url))
+
+def generate_graph_data(project_map: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the graph (nodes and index-based links) drawn on the project map page."""
+    return _build_graph(project_map, group_routes_by_prefix(project_map["routes"]))
+
+def _iter_html_page(project_map: Dict[str, Any], graph_url: Optional[str] = None) -> Iterator[str]:
+    """Yield the project map page piece by piece."""
     # Group routes by prefix
     grouped_routes = group_routes_by_prefix(project_map["routes"])
-    project_map["grouped_routes"] = grouped_routes
     
-    routes_html = _generate_routes_html(project_map["routes"])
-    models_html = _generate_models_html(project_map["models"])
-    dependencies_html = _generate_dependencies_html(project_map["dependencies"])
+    yield _PAGE_HEAD
+    yield _generate_routes_html(grouped_routes)
+    yield _PAGE_AFTER_ROUTES
+    yield _generate_models_html(project_map["models"])
+    yield _PAGE_AFTER_MODELS
+    yield _generate_dependencies_html(project_map["dependencies"])
+    yield _PAGE_BEFORE_JSON
+    if graph_url is None:
+        # Only the graph the page draws is embedded, not the whole map
+        yield _script_json({"graph": _build_graph(project_map, grouped_routes), "url": None})
+    else:
+        # The graph is fetched from a separately cacheable URL
+        yield _script_json({"graph": None, "url": graph_url})
+    yield _PAGE_TAIL
+
+def _build_graph(project_map: Dict[str, Any], grouped_routes: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Any]:
+    """Build the D3 nodes and links drawn on the project map page."""
+    nodes = []
+    links = []
+    node_index = {}  # Name -> index into nodes; links refer to nodes by index
+    
+    # Details carry only what the tooltips show beyond the node name; every
+    # string in them is serialized once per node
+    def add_node(kind: str, name: str, details: Dict[str, Any]) -> int:
+        index = len(nodes)
+        nodes.append({"id": f"{kind}_{index}", "name": name, "type": kind, "details": details})
+        return index
+    
+    # Add route groups as nodes
+    for prefix, prefix_routes in grouped_routes.items():
+        if prefix != '/':  # Skip root group
+            node_index[prefix] = add_node("group", prefix, {"count": len(prefix_routes)})
+    
+    # Add routes as nodes
+    route_indices = []
+    for route in project_map["routes"]:
+        methods = route["methods"]
+        method_string = methods if isinstance(methods, str) else ", ".join(methods)
+        index = add_node("route", f"{method_string} {route['path']}", {
+            "path": route["path"],
+            "methods": method_string,
+            "endpoint": route["endpoint"],
+            "response_model": route["response_model"],
+        })
+        node_index[route["endpoint"]] = index
+        route_indices.append(index)
+        
+        # Connect routes to their groups
+        route_prefix = _route_prefix(route["path"])
+        if route_prefix != '/' and route_prefix in node_index:
+            links.append({"source": node_index[route_prefix], "target": index, "type": "group_member"})
+    
+    # Add models as nodes
+    model_indices = {}
+    for model in project_map["models"]:
+        index = add_node("model", model["name"], {
+            "module": model["module"],
+            "field_count": len(model["fields"]),
+        })
+        node_index[model["name"]] = model_indices[model["name"]] = index
+    
+    # Add dependencies as nodes if they aren't routes
+    all_deps = dict.fromkeys(dep for deps in project_map["dependencies"].values() for dep in deps)
+    for dep in all_deps:
+        if dep not in node_index:
+            node_index[dep] = add_node("dependency", dep, {})
     
-    # Generate project map JSON for JavaScript visualization
-    project_map_json = json.dumps(project_map, cls=SetEncoder)
+    # Type strings look like "typing.List[app.Item]" or "<class 'app.Item'>",
+    # so every identifier in them that names a model is linked; each distinct
+    # string is parsed once
+    referenced_models: Dict[str, List[int]] = {}
     
-    return f"""
+    def models_in(type_str: str) -> List[int]:
+        indices = referenced_models.get(type_str)
+        if indices is None:
+            indices = list(dict.fromkeys(
+                model_indices[name] for name in _TYPE_IDENT_RE.findall(type_str) if name in model_indices
+            ))
+            referenced_models[type_str] = indices
+        return indices
+    
+    # Create links from routes to models and dependencies
+    for route, route_index in zip(project_map["routes"], route_indices):
+        if route["response_model"]:
+            for model_index in models_in(route["response_model"]):
+                links.append({"source": route_index, "target": model_index, "type": "returns"})
+        
+        for param in route["parameters"]:
+            for model_index in models_in(param["annotation"]):
+                links.append({"source": model_index, "target": route_index, "type": "parameter"})
+        
+        for dep in route["dependencies"]:
+            dep_index = node_index.get(dep["name"])
+            if dep_index is not None:
+                links.append({"source": route_index, "target": dep_index, "type": "depends_on"})
+    
+    # Create links from route endpoint to dependencies
+    for endpoint, deps in project_map["dependencies"].items():
+        if endpoint in node_index:
+            for dep in deps:
+                if dep in node_index:
+                    links.append({"source": node_index[endpoint], "target": node_index[dep], "type": "depends_on"})
+    
+    return {"nodes": nodes, "links": links}
+
+
+# Static parts of the project map page, in order around the dynamic sections
+_PAGE_HEAD = """
     <!DOCTYPE html>
     <html>
     <head>
         <title>FastAPI Project Map</title>
         <meta charset="UTF-8">
         <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <script src="https://d3js.org/d3.v7.min.js"></script>
+        <!-- d3 downloads in parallel with parsing the page and runs before the load event -->
+        <link rel="preconnect" href="https://d3js.org">
+        <script defer src="https://d3js.org/d3.v7.min.js"></script>
         <style>
-            body {{ font-family: Arial, sans-serif; margin: 0; padding: 20px; }}
-            .container {{ max-width: 1200px; margin: 0 auto; }}
-            .section {{ margin-bottom: 30px; }}
-            h1, h2, h3 {{ color: #333; }}
-            .tab-container {{ border: 1px solid #ddd; border-radius: 4px; overflow: hidden; }}
-            .tabs {{ display: flex; background: #f1f1f1; }}
-            .tab {{ padding: 10px 20px; cursor: pointer; }}
-            .tab.active {{ background: #fff; border-bottom: 2px solid #007bff; }}
-            .tab-content {{ display: none; padding: 20px; }}
-            .tab-content.active {{ display: block; }}
-            .route {{ border: 1px solid #ddd; margin-bottom: 10px; padding: 10px; border-radius: 4px; }}
-            .model {{ border: 1px solid #ddd; margin-bottom: 10px; padding: 10px; border-radius: 4px; }}
-            .method {{ display: inline-block; padding: 2px 6px; border-radius: 4px; font-size: 12px; font-weight: bold; margin-right: 5px; }}
-            .method.get {{ background-color: #61affe; color: white; }}
-            .method.post {{ background-color: #49cc90; color: white; }}
-            .method.put {{ background-color: #fca130; color: white; }}
-            .method.delete {{ background-color: #f93e3e; color: white; }}
-            .method.patch {{ background-color: #50e3c2; color: white; }}
-            #visualization {{ height: 700px; border: 1px solid #ddd; border-radius: 4px; overflow: hidden; position: relative; }}
-            #graph-container {{ width: 100%; height: 100%; overflow: auto; }}
+            body { font-family: Arial, sans-serif; margin: 0; padding: 20px; }
+            .container { max-width: 1200px; margin: 0 auto; }
+            .section { margin-bottom: 30px; }
+            h1, h2, h3 { color: #333; }
+            .tab-container { border: 1px solid #ddd; border-radius: 4px; overflow: hidden; }
+            .tabs { display: flex; background: #f1f1f1; }
+            .tab { padding: 10px 20px; cursor: pointer; }
+            .tab.active { background: #fff; border-bottom: 2px solid #007bff; }
+            .tab-content { display: none; padding: 20px; }
+            .tab-content.active { display: block; }
+            .route { border: 1px solid #ddd; margin-bottom: 10px; padding: 10px; border-radius: 4px; }
+            .model { border: 1px solid #ddd; margin-bottom: 10px; padding: 10px; border-radius: 4px; }
+            .method { display: inline-block; padding: 2px 6px; border-radius: 4px; font-size: 12px; font-weight: bold; margin-right: 5px; }
+            .method.get { background-color: #61affe; color: white; }
+            .method.post { background-color: #49cc90; color: white; }
+            .method.put { background-color: #fca130; color: white; }
+            .method.delete { background-color: #f93e3e; color: white; }
+            .method.patch { background-color: #50e3c2; color: white; }
+            #visualization { height: 700px; border: 1px solid #ddd; border-radius: 4px; overflow: hidden; position: relative; }
+            #graph-container { width: 100%; height: 100%; overflow: auto; }
+            .graph-error { color: #f93e3e; padding: 20px; }
             
             /* D3 Visualization Styles */
-            .node {{ cursor: pointer; }}
-            .node text {{ font-size: 12px; }}
-            .node circle {{ stroke-width: 2px; }}
-            .node-route circle {{ fill: #61affe; }}
-            .node-model circle {{ fill: #fca130; }}
-            .node-dependency circle {{ fill: #49cc90; }}
-            .link {{ stroke: #999; stroke-opacity: 0.6; stroke-width: 1.5px; }}
-            
-            .tooltip {{ 
+            .node { cursor: pointer; }
+            .node text { font-size: 12px; }
+            .node circle { stroke-width: 2px; }
+            .node-route circle { fill: #61affe; }
+            .node-model circle { fill: #fca130; }
+            .node-dependency circle { fill: #49cc90; }
+            .link { stroke: #999; stroke-opacity: 0.6; stroke-width: 1.5px; }
+            
+            .tooltip { 
                 position: absolute; 
                 padding: 10px; 
                 background: white; 
@@ -73,9 +246,9 @@ def generate_html_visualization(project_map: Dict[str, Any]) -> str:
                 box-shadow: 0 2px 4px rgba(0,0,0,0.2);
                 max-width: 300px;
                 z-index: 1000;
-            }}
+            }
             
-            .legend {{ 
+            .legend { 
                 position: absolute; 
                 top: 10px; 
                 right: 10px; 
@@ -84,23 +257,23 @@ def generate_html_visualization(project_map: Dict[str, Any]) -> str:
                 border: 1px solid #ddd; 
                 border-radius: 4px; 
                 box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            }}
+            }
             
-            .legend-item {{ 
+            .legend-item { 
                 display: flex; 
                 align-items: center; 
                 margin-bottom: 5px; 
-            }}
+            }
             
-            .legend-color {{ 
+            .legend-color { 
                 width: 15px; 
                 height: 15px; 
                 margin-right: 8px; 
                 border-radius: 50%; 
                 display: inline-block; 
-            }}
+            }
             
-            .controls {{
+            .controls {
                 position: absolute;
                 bottom: 10px;
                 left: 10px;
@@ -109,50 +282,50 @@ def generate_html_visualization(project_map: Dict[str, Any]) -> str:
                 border-radius: 4px;
                 border: 1px solid #ddd;
                 box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            }}
+            }
             
-            button {{
+            button {
                 border: none;
                 background: #f1f1f1;
                 padding: 5px 10px;
                 border-radius: 4px;
                 margin: 0 5px;
                 cursor: pointer;
-            }}
+            }
             
-            button:hover {{
+            button:hover {
                 background: #ddd;
-            }}
+            }
             
-            .group-node rect {{
+            .group-node rect {
                 fill: #e8e8e8;
                 stroke: #aaa;
                 rx: 5;
                 ry: 5;
-            }}
+            }
             
-            .route-group {{
+            .route-group {
                 margin-bottom: 20px;
                 border: 1px solid #ddd;
                 border-radius: 4px;
                 overflow: hidden;
-            }}
+            }
             
-            .route-group-header {{
+            .route-group-header {
                 background: #f1f1f1;
                 padding: 10px;
                 font-weight: bold;
                 border-bottom: 1px solid #ddd;
                 cursor: pointer;
-            }}
+            }
             
-            .route-group-content {{
+            .route-group-content {
                 padding: 10px;
-            }}
+            }
             
-            .collapsed .route-group-content {{
+            .collapsed .route-group-content {
                 display: none;
-            }}
+            }
         </style>
     </head>
     <body>
@@ -200,217 +373,117 @@ def generate_html_visualization(project_map: Dict[str, Any]) -> str:
                 
                 <div id="routes-tab" class="tab-content">
                     <h2>Routes</h2>
-                    {routes_html}
+                    """
+_PAGE_AFTER_ROUTES = """
                 </div>
                 
                 <div id="models-tab" class="tab-content">
                     <h2>Models</h2>
-                    {models_html}
+                    """
+_PAGE_AFTER_MODELS = """
                 </div>
                 
                 <div id="dependencies-tab" class="tab-content">
                     <h2>Dependencies</h2>
-                    {dependencies_html}
+                    """
+_PAGE_BEFORE_JSON = """
                 </div>
             </div>
         </div>
         
         <script>
-            // Store project map data for visualization
-            const projectMap = {project_map_json};
+            // Graph of the project map (nodes and index-based links), built server
+            // side; either embedded or fetched from a URL
+            const projectGraphSource = """
+_PAGE_TAIL = """;
+            let projectGraph = projectGraphSource.graph;
+            
+            // Resolve the graph, fetching it once when it isn't embedded
+            function loadProjectGraph() {
+                if (projectGraph) {
+                    return Promise.resolve(projectGraph);
+                }
+                return fetch(projectGraphSource.url)
+                    .then(response => {
+                        if (!response.ok) {
+                            throw new Error(`HTTP ${response.status}`);
+                        }
+                        return response.json();
+                    })
+                    .then(graph => (projectGraph = graph));
+            }
             
-            function openTab(evt, tabName) {{
+            // Say why the graph tab stays empty instead of leaving it blank
+            function showGraphError(error) {
+                const message = document.createElement('p');
+                message.className = 'graph-error';
+                message.textContent = `Could not load the graph: ${error.message}`;
+                document.getElementById('graph-container').replaceChildren(message);
+            }
+            
+            // Start fetching right away, while d3 is still downloading
+            const projectGraphReady = loadProjectGraph().catch(showGraphError);
+            
+            function openTab(evt, tabName) {
                 const tabContents = document.getElementsByClassName("tab-content");
-                for (let i = 0; i < tabContents.length; i++) {{
+                for (let i = 0; i < tabContents.length; i++) {
                     tabContents[i].classList.remove("active");
-                }}
+                }
                 
                 const tabs = document.getElementsByClassName("tab");
-                for (let i = 0; i < tabs.length; i++) {{
+                for (let i = 0; i < tabs.length; i++) {
                     tabs[i].classList.remove("active");
-                }}
+                }
                 
                 document.getElementById(tabName).classList.add("active");
                 evt.currentTarget.classList.add("active");
                 
-                if (tabName === 'visualization-tab') {{
-                    renderVisualization();
-                }}
+                if (tabName === 'visualization-tab') {
+                    // The graph survives tab switches; only fit it to the current size
+                    if (visualizationRendered) {
+                        resizeVisualization();
+                    } else {
+                        renderVisualization();
+                    }
+                }
                 
-                if (tabName === 'routes-tab') {{
+                if (tabName === 'routes-tab') {
                     initRouteGroupToggles();
-                }}
-            }}
+                }
+            }
             
-            function initRouteGroupToggles() {{
+            function initRouteGroupToggles() {
                 const headers = document.getElementsByClassName('route-group-header');
-                for (let i = 0; i < headers.length; i++) {{
-                    headers[i].addEventListener('click', function() {{
+                for (let i = 0; i < headers.length; i++) {
+                    headers[i].addEventListener('click', function() {
                         this.parentNode.classList.toggle('collapsed');
-                    }});
-                }}
-            }}
-            
-            // Transform the project map into a format suitable for D3
-            function transformProjectData(projectMap) {{
-                const nodes = [];
-                const links = [];
-                const nodeMap = new Map();
-                let nodeId = 0;
-                
-                // Add route groups as nodes
-                const groupedRoutes = projectMap.grouped_routes;
-                Object.keys(groupedRoutes).forEach(prefix => {{
-                    if (prefix !== '/') {{  // Skip root group
-                        const id = 'group_' + nodeId++;
-                        const node = {{
-                            id: id,
-                            name: prefix,
-                            type: 'group',
-                            details: {{ name: prefix, count: groupedRoutes[prefix].length }},
-                            routes: groupedRoutes[prefix].map(r => r.endpoint)
-                        }};
-                        
-                        nodes.push(node);
-                        nodeMap.set(prefix, id);
-                    }}
-                }});
-                
-                // Add routes as nodes
-                projectMap.routes.forEach(route => {{
-                    const id = 'route_' + nodeId++;
-                    const methodString = Array.isArray(route.methods) ? 
-                        route.methods.join(', ') : route.methods;
-                        
-                    const node = {{
-                        id: id,
-                        name: `${{methodString}} ${{route.path}}`,
-                        type: 'route',
-                        details: route,
-                        endpoint: route.endpoint
-                    }};
-                    
-                    nodes.push(node);
-                    nodeMap.set(route.endpoint, id);
-                    
-                    // Connect routes to their groups
-                    const routePrefix = getRoutePrefix(route.path);
-                    if (routePrefix !== '/' && nodeMap.has(routePrefix)) {{
-                        links.push({{
-                            source: nodeMap.get(routePrefix),
-                            target: id,
-                            type: 'group_member'
-                        }});
-                    }}
-                }});
-                
-                // Add models as nodes
-                projectMap.models.forEach(model => {{
-                    const id = 'model_' + nodeId++;
-                    const node = {{
-                        id: id,
-                        name: model.name,
-                        type: 'model',
-                        details: model
-                    }};
-                    
-                    nodes.push(node);
-                    nodeMap.set(model.name, id);
-                }});
-                
-                // Add dependencies as nodes if they aren't routes
-                const allDeps = new Set();
-                Object.values(projectMap.dependencies).forEach(deps => {{
-                    deps.forEach(dep => allDeps.add(dep));
-                }});
-                
-                allDeps.forEach(dep => {{
-                    if (!nodeMap.has(dep)) {{
-                        const id = 'dep_' + nodeId++;
-                        const node = {{
-                            id: id,
-                            name: dep,
-                            type: 'dependency',
-                            details: {{ name: dep }}
-                        }};
-                        
-                        nodes.push(node);
-                        nodeMap.set(dep, id);
-                    }}
-                }});
-                
-                // Create links from routes to models
-                projectMap.routes.forEach(route => {{
-                    // Link to response model if any
-                    if (route.response_model) {{
-                        const modelName = route.response_model.split('[')[0].split('.')[-1];
-                        if (nodeMap.has(modelName)) {{
-                            links.push({{
-                                source: nodeMap.get(route.endpoint),
-                                target: nodeMap.get(modelName),
-                                type: 'returns'
-                            }});
-                        }}
-                    }}
-                    
-                    // Link to parameter models
-                    route.parameters.forEach(param => {{
-                        const paramType = param.annotation.split('[')[0].split('.')[-1];
-                        if (nodeMap.has(paramType)) {{
-                            links.push({{
-                                source: nodeMap.get(paramType),
-                                target: nodeMap.get(route.endpoint),
-                                type: 'parameter'
-                            }});
-                        }}
-                    }});
-                    
-                    // Link to dependencies
-                    route.dependencies.forEach(dep => {{
-                        const depName = dep.name;
-                        if (nodeMap.has(depName)) {{
-                            links.push({{
-                                source: nodeMap.get(route.endpoint),
-                                target: nodeMap.get(depName),
-                                type: 'depends_on'
-                            }});
-                        }}
-                    }});
-                }});
-                
-                // Create links from route endpoint to dependencies
-                Object.entries(projectMap.dependencies).forEach(([endpoint, deps]) => {{
-                    if (nodeMap.has(endpoint)) {{
-                        deps.forEach(dep => {{
-                            if (nodeMap.has(dep)) {{
-                                links.push({{
-                                    source: nodeMap.get(endpoint),
-                                    target: nodeMap.get(dep),
-                                    type: 'depends_on'
-                                }});
-                            }}
-                        }});
-                    }}
-                }});
-                
-                return {{ nodes, links }};
-            }}
-            
-            // Helper function to get the prefix for grouping
-            function getRoutePrefix(path) {{
-                if (!path.startsWith('/')) {{
-                    path = '/' + path;
-                }}
-                
-                const parts = path.split('/');
-                if (parts.length <= 2) {{
-                    return '/';  // Root group
-                }}
-                
-                return '/' + parts[1];  // First-level grouping
-            }}
-            
-            function renderVisualization() {{
+                    });
+                }
+            }
+            
+            // Graphs with more nodes than this are drawn on a canvas instead of SVG
+            const CANVAS_NODE_THRESHOLD = 1000;
+            // Layouts of graphs with more nodes than this are computed up front
+            // instead of animated
+            const PRETICK_NODE_THRESHOLD = 200;
+            const NODE_COLORS = { route: '#61affe', model: '#fca130', dependency: '#49cc90', group: '#e8e8e8' };
+            const NODE_RADII = { route: 10, model: 8, dependency: 6, group: 12 };
+            
+            // Force simulation of the rendered graph, a callback resizing its
+            // surface and the size it was last laid out for, reused on resize
+            let currentView = null;
+            let visualizationRendered = false;
+            
+            // Force a full rebuild on the next visit, e.g. after changing projectGraph
+            function invalidateVisualization() {
+                visualizationRendered = false;
+            }
+            
+            function renderVisualization() {
+                if (!projectGraph) {
+                    // Still loading; rendered once the graph arrives
+                    return;
+                }
                 const container = document.getElementById('graph-container');
                 
                 // Clear any previous visualization
@@ -420,26 +493,49 @@ def generate_html_visualization(project_map: Dict[str, Any]) -> str:
                 const width = container.clientWidth;
                 const height = container.clientHeight;
                 
-                // Transform project data for D3
-                const graphData = transformProjectData(projectMap);
+                // The force layout mutates nodes and links, so work on copies
+                const graphData = {
+                    nodes: projectGraph.nodes.map(n => ({ ...n })),
+                    links: projectGraph.links.map(l => ({ ...l }))
+                };
+                
+                // Neighbour sets (by node index) for constant-time hover highlighting;
+                // built before the force layout replaces link endpoints with node objects
+                const adjacency = graphData.nodes.map((n, i) => new Set([i]));
+                graphData.links.forEach(l => {
+                    const source = typeof l.source === 'object' ? l.source.index : l.source;
+                    const target = typeof l.target === 'object' ? l.target.index : l.target;
+                    adjacency[source].add(target);
+                    adjacency[target].add(source);
+                });
+                
+                // Create tooltip
+                const tooltip = d3.select('#visualization')
+                    .append('div')
+                    .attr('class', 'tooltip')
+                    .style('opacity', 0);
+                
+                // SVG keeps several DOM elements per node and link; large graphs
+                // are drawn on a canvas instead
+                if (graphData.nodes.length > CANVAS_NODE_THRESHOLD) {
+                    renderCanvasGraph(container, graphData, adjacency, tooltip, width, height);
+                    return;
+                }
                 
                 // Create SVG
                 const svg = d3.select('#graph-container')
                     .append('svg')
                     .attr('width', width * 2)  // Make SVG larger than container to allow scrolling
                     .attr('height', height * 2)
-                    .attr('viewBox', [0, 0, width, height])
-                    .call(d3.zoom().on('zoom', (event) => {{
-                        g.attr('transform', event.transform);
-                    }}));
+                    .attr('viewBox', [0, 0, width, height]);
                 
                 const g = svg.append('g');
                 
-                // Create tooltip
-                const tooltip = d3.select('#visualization')
-                    .append('div')
-                    .attr('class', 'tooltip')
-                    .style('opacity', 0);
+                // One zoom behaviour, shared by mouse zooming and the zoom buttons
+                const zoom = d3.zoom().on('zoom', (event) => {
+                    g.attr('transform', event.transform);
+                });
+                svg.call(zoom);
                 
                 // Create links
                 const link = g.append('g')
@@ -472,7 +568,7 @@ def generate_html_visualization(project_map: Dict[str, Any]) -> str:
                 groups.append('text')
                     .attr('dy', 5)
                     .attr('text-anchor', 'middle')
-                    .text(d => `${{d.name}} (${{d.details.count}})`);
+                    .text(d => `${d.name} (${d.details.count})`);
                 
                 // Define different node types
                 const node = g.append('g')
@@ -480,7 +576,7 @@ def generate_html_visualization(project_map: Dict[str, Any]) -> str:
                     .data(graphData.nodes.filter(d => d.type !== 'group'))
                     .enter()
                     .append('g')
-                    .attr('class', d => `node node-${{d.type}}`)
+                    .attr('class', d => `node node-${d.type}`)
                     .call(d3.drag()
                         .on('start', dragStarted)
                         .on('drag', dragged)
@@ -495,70 +591,43 @@ def generate_html_visualization(project_map: Dict[str, Any]) -> str:
                 node.append('text')
                     .attr('dy', 20)
                     .attr('text-anchor', 'middle')
-                    .text(d => d.name)
-                    .each(function(d) {{
-                        const self = d3.select(this);
-                        const textLength = self.node().getComputedTextLength();
-                        
-                        // If text is too long, truncate it
-                        if (textLength > 100) {{
-                            self.text(d.name.substring(0, 20) + '...');
-                        }}
-                    }});
+                    // Truncate long labels by length rather than measuring each
+                    // rendered label, which forces a layout per node
+                    .text(d => d.name.length > 20 ? d.name.substring(0, 20) + '...' : d.name);
                 
                 // Add hover behavior to nodes
                 const allNodes = g.selectAll('.node')
-                    .on('mouseover', function(event, d) {{
+                    .on('mouseover', function(event, d) {
                         // Highlight connected links and nodes
-                        link.style('stroke-opacity', l => {{
-                            if (l.source.id === d.id || l.target.id === d.id) {{
+                        link.style('stroke-opacity', l => {
+                            if (l.source.id === d.id || l.target.id === d.id) {
                                 return 1;
-                            }} else {{
+                            } else {
                                 return 0.2;
-                            }}
-                        }})
-                        .style('stroke-width', l => {{
-                            if (l.source.id === d.id || l.target.id === d.id) {{
+                            }
+                        })
+                        .style('stroke-width', l => {
+                            if (l.source.id === d.id || l.target.id === d.id) {
                                 return 3;
-                            }} else {{
+                            } else {
                                 return 1.5;
-                            }}
-                        }});
+                            }
+                        });
                         
-                        g.selectAll('.node').style('opacity', n => {{
+                        g.selectAll('.node').style('opacity', n => {
                             return isConnected(d, n) ? 1 : 0.2;
-                        }});
+                        });
                         
                         // Show tooltip with details
                         tooltip.transition()
                             .duration(200)
                             .style('opacity', 0.9);
                         
-                        let tooltipContent = `<strong>${{d.name}}</strong><br/>Type: ${{d.type}}<br/>`;
-                        
-                        if (d.type === 'route') {{
-                            tooltipContent += `
-                                Path: ${{d.details.path}}<br/>
-                                Methods: ${{Array.isArray(d.details.methods) ? d.details.methods.join(', ') : d.details.methods}}<br/>
-                                Handler: ${{d.details.endpoint}}<br/>
-                                ${{d.details.response_model ? `Response Model: ${{d.details.response_model}}<br/>` : ''}}
-                            `;
-                        }} else if (d.type === 'model') {{
-                            tooltipContent += `
-                                Module: ${{d.details.module}}<br/>
-                                Fields: ${{d.details.fields.length}}<br/>
-                            `;
-                        }} else if (d.type === 'group') {{
-                            tooltipContent += `
-                                Contains: ${{d.details.count}} routes<br/>
-                            `;
-                        }}
-                        
-                        tooltip.html(tooltipContent)
+                        tooltip.html(tooltipHtml(d))
                             .style('left', (event.pageX + 10) + 'px')
                             .style('top', (event.pageY - 28) + 'px');
-                    }})
-                    .on('mouseout', function() {{
+                    })
+                    .on('mouseout', function() {
                         // Restore original appearance
                         link.style('stroke-opacity', 0.6).style('stroke-width', 1.5);
                         g.selectAll('.node').style('opacity', 1);
@@ -567,104 +636,333 @@ def generate_html_visualization(project_map: Dict[str, Any]) -> str:
                         tooltip.transition()
                             .duration(500)
                             .style('opacity', 0);
-                    }});
+                    });
                 
                 // Check if two nodes are connected
-                function isConnected(a, b) {{
-                    if (a.id === b.id) return true;
-                    
-                    return graphData.links.some(l => {{
-                        return (l.source.id === a.id && l.target.id === b.id) ||
-                               (l.source.id === b.id && l.target.id === a.id);
-                    }});
-                }}
+                function isConnected(a, b) {
+                    return adjacency[a.index].has(b.index);
+                }
                 
                 // Initialize force simulation
-                const simulation = d3.forceSimulation(graphData.nodes)
-                    .force('link', d3.forceLink(graphData.links).id(d => d.id).distance(100))
-                    .force('charge', d3.forceManyBody().strength(-300))
-                    .force('center', d3.forceCenter(width / 2, height / 2))
-                    .force('collide', d3.forceCollide().radius(40))
+                const simulation = createSimulation(graphData, width, height)
                     .on('tick', ticked);
                 
+                if (graphData.nodes.length > PRETICK_NODE_THRESHOLD) {
+                    settleLayout(simulation);
+                    ticked();
+                }
+                
+                currentView = {
+                    simulation,
+                    resize: (w, h) => svg
+                        .attr('width', w * 2)
+                        .attr('height', h * 2)
+                        .attr('viewBox', [0, 0, w, h]),
+                    width,
+                    height
+                };
+                visualizationRendered = true;
+                
                 // Update positions on each tick
-                function ticked() {{
+                function ticked() {
                     link
                         .attr('x1', d => d.source.x)
                         .attr('y1', d => d.source.y)
                         .attr('x2', d => d.target.x)
                         .attr('y2', d => d.target.y);
                     
-                    allNodes.attr('transform', d => `translate(${{d.x}},${{d.y}})`);
-                }}
+                    allNodes.attr('transform', d => `translate(${d.x},${d.y})`);
+                }
                 
                 // Drag functions
-                function dragStarted(event, d) {{
+                function dragStarted(event, d) {
                     if (!event.active) simulation.alphaTarget(0.3).restart();
                     d.fx = d.x;
                     d.fy = d.y;
-                }}
+                }
                 
-                function dragged(event, d) {{
+                function dragged(event, d) {
                     d.fx = event.x;
                     d.fy = event.y;
-                }}
+                }
                 
-                function dragEnded(event, d) {{
+                function dragEnded(event, d) {
                     if (!event.active) simulation.alphaTarget(0);
                     d.fx = null;
                     d.fy = null;
-                }}
-                
-                // Zoom controls
-                document.getElementById('zoom-in').addEventListener('click', function() {{
-                    const currentTransform = d3.zoomTransform(svg.node());
-                    svg.transition().duration(500).call(
-                        d3.zoom().on('zoom', event => g.attr('transform', event.transform))
-                            .transform, 
-                        d3.zoomIdentity.translate(currentTransform.x, currentTransform.y).scale(currentTransform.k * 1.5)
-                    );
-                }});
-                
-                document.getElementById('zoom-out').addEventListener('click', function() {{
-                    const currentTransform = d3.zoomTransform(svg.node());
-                    svg.transition().duration(500).call(
-                        d3.zoom().on('zoom', event => g.attr('transform', event.transform))
-                            .transform, 
-                        d3.zoomIdentity.translate(currentTransform.x, currentTransform.y).scale(currentTransform.k / 1.5)
-                    );
-                }});
-                
-                document.getElementById('reset').addEventListener('click', function() {{
-                    svg.transition().duration(500).call(
-                        d3.zoom().on('zoom', event => g.attr('transform', event.transform))
-                            .transform, 
-                        d3.zoomIdentity
-                    );
-                }});
-            }}
+                }
+                
+                setZoomControls(svg, zoom);
+            }
+            
+            // Seed each node type on its own ring (groups innermost) so the layout
+            // starts close to its settled shape
+            const LAYOUT_RINGS = { group: 0, route: 1, model: 2, dependency: 3 };
+            
+            function seedPositions(nodes, width, height) {
+                const counts = {};
+                nodes.forEach(n => { counts[n.type] = (counts[n.type] || 0) + 1; });
+                
+                const placed = {};
+                nodes.forEach(n => {
+                    const i = placed[n.type] = (placed[n.type] || 0) + 1;
+                    const radius = 100 + LAYOUT_RINGS[n.type] * 150;
+                    const angle = 2 * Math.PI * i / counts[n.type];
+                    n.x = width / 2 + radius * Math.cos(angle);
+                    n.y = height / 2 + radius * Math.sin(angle);
+                });
+            }
+            
+            // Gently pull every node towards the middle of the surface
+            function centerSimulation(simulation, width, height) {
+                return simulation
+                    .force('x', d3.forceX(width / 2).strength(0.05))
+                    .force('y', d3.forceY(height / 2).strength(0.05));
+            }
+            
+            function createSimulation(graphData, width, height) {
+                seedPositions(graphData.nodes, width, height);
+                return centerSimulation(d3.forceSimulation(graphData.nodes), width, height)
+                    // Links hold node indices, d3's default id accessor
+                    .force('link', d3.forceLink(graphData.links).distance(100))
+                    .force('charge', d3.forceManyBody().strength(-300))
+                    .force('collide', d3.forceCollide().radius(40));
+            }
+            
+            // Point the zoom buttons at the current graph; d3's on() replaces the
+            // previous handlers, so re-rendering doesn't stack listeners
+            function setZoomControls(target, zoom) {
+                d3.select('#zoom-in').on('click', () => {
+                    target.transition().duration(500).call(zoom.scaleBy, 1.5);
+                });
+                d3.select('#zoom-out').on('click', () => {
+                    target.transition().duration(500).call(zoom.scaleBy, 1 / 1.5);
+                });
+                d3.select('#reset').on('click', () => {
+                    target.transition().duration(500).call(zoom.transform, d3.zoomIdentity);
+                });
+            }
+            
+            // Run a layout to convergence synchronously, then render it once; the
+            // simulation only runs again while a node is dragged or on resize
+            function settleLayout(simulation) {
+                simulation.stop();
+                simulation.tick(Math.ceil(Math.log(simulation.alphaMin()) / Math.log(1 - simulation.alphaDecay())));
+            }
+            
+            // Tooltip markup for a graph node
+            // Escape text before it is placed into tooltip markup
+            function escapeHtml(value) {
+                return String(value).replace(/[&<>"']/g, c => ({
+                    '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#x27;'
+                })[c]);
+            }
+            
+            function tooltipHtml(d) {
+                let tooltipContent = `<strong>${escapeHtml(d.name)}</strong><br/>Type: ${d.type}<br/>`;
+                
+                if (d.type === 'route') {
+                    tooltipContent += `
+                        Path: ${escapeHtml(d.details.path)}<br/>
+                        Methods: ${escapeHtml(d.details.methods)}<br/>
+                        Handler: ${escapeHtml(d.details.endpoint)}<br/>
+                        ${d.details.response_model ? `Response Model: ${escapeHtml(d.details.response_model)}<br/>` : ''}
+                    `;
+                } else if (d.type === 'model') {
+                    tooltipContent += `
+                        Module: ${escapeHtml(d.details.module)}<br/>
+                        Fields: ${d.details.field_count}<br/>
+                    `;
+                } else if (d.type === 'group') {
+                    tooltipContent += `
+                        Contains: ${d.details.count} routes<br/>
+                    `;
+                }
+                
+                return tooltipContent;
+            }
+            
+            // Draw the graph on a single canvas: one element regardless of size,
+            // with hit-testing through the simulation instead of DOM events
+            function renderCanvasGraph(container, graphData, adjacency, tooltip, width, height) {
+                const ratio = window.devicePixelRatio || 1;
+                const canvas = d3.select(container).append('canvas');
+                const context = canvas.node().getContext('2d');
+                const solidLinks = graphData.links.filter(l => l.type !== 'parameter');
+                const dashedLinks = graphData.links.filter(l => l.type === 'parameter');
+                let transform = d3.zoomIdentity;
+                let hovered = null;
+                let hoveredLinks = [];
+                
+                function strokeLinks(links, dash) {
+                    context.setLineDash(dash);
+                    context.beginPath();
+                    links.forEach(l => {
+                        context.moveTo(l.source.x, l.source.y);
+                        context.lineTo(l.target.x, l.target.y);
+                    });
+                    context.stroke();
+                }
+                
+                function draw() {
+                    context.save();
+                    context.setTransform(ratio, 0, 0, ratio, 0, 0);
+                    context.clearRect(0, 0, canvas.node().width / ratio, canvas.node().height / ratio);
+                    context.translate(transform.x, transform.y);
+                    context.scale(transform.k, transform.k);
+                    
+                    // Links, with the hovered node's links emphasised on top
+                    context.strokeStyle = '#999';
+                    context.lineWidth = 1.5;
+                    context.globalAlpha = hovered ? 0.2 : 0.6;
+                    strokeLinks(solidLinks, []);
+                    strokeLinks(dashedLinks, [5, 5]);
+                    if (hovered) {
+                        context.globalAlpha = 1;
+                        context.lineWidth = 3;
+                        strokeLinks(hoveredLinks, []);
+                    }
+                    context.setLineDash([]);
+                    
+                    // Nodes, faded unless connected to the hovered node
+                    context.strokeStyle = '#fff';
+                    context.lineWidth = 2;
+                    graphData.nodes.forEach(n => {
+                        context.globalAlpha = hovered && !adjacency[hovered.index].has(n.index) ? 0.2 : 1;
+                        context.beginPath();
+                        context.arc(n.x, n.y, NODE_RADII[n.type], 0, 2 * Math.PI);
+                        context.fillStyle = NODE_COLORS[n.type];
+                        context.fill();
+                        context.stroke();
+                    });
+                    context.restore();
+                }
+                
+                function setSize(w, h) {
+                    canvas
+                        .attr('width', w * ratio)
+                        .attr('height', h * ratio)
+                        .style('width', w + 'px')
+                        .style('height', h + 'px');
+                    draw();
+                }
+                
+                function nodeAt(event) {
+                    const [x, y] = transform.invert(d3.pointer(event, canvas.node()));
+                    return simulation.find(x, y, 20) || null;
+                }
+                
+                const simulation = createSimulation(graphData, width, height)
+                    .on('tick', draw);
+                
+                // Drag nodes; pointer positions go through the zoom transform
+                canvas.call(d3.drag()
+                    .subject(event => nodeAt(event.sourceEvent))
+                    .on('start', event => {
+                        if (!event.active) simulation.alphaTarget(0.3).restart();
+                        event.subject.fx = event.subject.x;
+                        event.subject.fy = event.subject.y;
+                    })
+                    .on('drag', event => {
+                        const [x, y] = transform.invert(d3.pointer(event.sourceEvent, canvas.node()));
+                        event.subject.fx = x;
+                        event.subject.fy = y;
+                    })
+                    .on('end', event => {
+                        if (!event.active) simulation.alphaTarget(0);
+                        event.subject.fx = null;
+                        event.subject.fy = null;
+                    }));
+                
+                // Pan and zoom by redrawing with a new transform
+                const zoom = d3.zoom().on('zoom', event => {
+                    transform = event.transform;
+                    draw();
+                });
+                canvas.call(zoom);
+                
+                // Hover highlighting and tooltip
+                canvas
+                    .on('mousemove', event => {
+                        const found = nodeAt(event);
+                        if (found !== hovered) {
+                            hovered = found;
+                            hoveredLinks = found ? graphData.links.filter(l => l.source === found || l.target === found) : [];
+                            draw();
+                            tooltip.transition()
+                                .duration(found ? 200 : 500)
+                                .style('opacity', found ? 0.9 : 0);
+                        }
+                        if (found) {
+                            tooltip.html(tooltipHtml(found))
+                                .style('left', (event.pageX + 10) + 'px')
+                                .style('top', (event.pageY - 28) + 'px');
+                        }
+                    })
+                    .on('mouseleave', () => {
+                        hovered = null;
+                        hoveredLinks = [];
+                        draw();
+                        tooltip.transition().duration(500).style('opacity', 0);
+                    });
+                
+                setZoomControls(canvas, zoom);
+                
+                if (graphData.nodes.length > PRETICK_NODE_THRESHOLD) {
+                    settleLayout(simulation);
+                }
+                
+                setSize(width, height);
+                currentView = { simulation, resize: setSize, width, height };
+                visualizationRendered = true;
+            }
             
             // Initialize the visualization
-            window.addEventListener('load', function() {{
-                renderVisualization();
+            window.addEventListener('load', function() {
                 initRouteGroupToggles();
-            }});
+                projectGraphReady.then(renderVisualization);
+            });
+            
+            // Fit the existing graph to the new size instead of rebuilding it
+            function resizeVisualization() {
+                if (!currentView) return;
+                
+                const container = document.getElementById('graph-container');
+                const width = container.clientWidth;
+                const height = container.clientHeight;
+                
+                // Revisiting the tab at the same size keeps the settled layout
+                // as it is; a hidden container has no size to fit
+                if (!width || !height || (width === currentView.width && height === currentView.height)) {
+                    return;
+                }
+                currentView.width = width;
+                currentView.height = height;
+                
+                currentView.resize(width, height);
+                centerSimulation(currentView.simulation, width, height)
+                    .alpha(0.3)
+                    .restart();
+            }
             
-            // Handle window resize
-            window.addEventListener('resize', function() {{
-                renderVisualization();
-            }});
+            // Handle window resize, at most once per animation frame
+            let resizeFrame = null;
+            window.addEventListener('resize', function() {
+                if (resizeFrame !== null) return;
+                resizeFrame = requestAnimationFrame(function() {
+                    resizeFrame = null;
+                    resizeVisualization();
+                });
+            });
         </script>
     </body>
     </html>
     """
 
-def _generate_routes_html(routes):
-    """Generate HTML for routes section."""
-    # Group routes by prefix
-    grouped_routes = group_routes_by_prefix(routes)
-    
-    html = ""
+
+def _generate_routes_html(grouped_routes):
+    """Generate HTML for routes section from routes grouped by prefix."""
+    parts = []
     for prefix, prefix_routes in grouped_routes.items():
         # Skip empty groups
         if not prefix_routes:
@@ -674,134 +972,274 @@ def _generate_routes_html(routes):
         if not group_id:
             group_id = "root"
         
-        html += f"""
-        <div class="route-group" id="group-{group_id}">
-            <div class="route-group-header">{prefix} ({len(prefix_routes)} routes)</div>
-            <div class="route-group-content">
-        """
+        parts.append(_ROUTE_GROUP_OPEN_TMPL({
+            "group_id": _esc(group_id),
+            "prefix": _esc(prefix),
+            "count": len(prefix_routes),
+        }))
         
         for route in prefix_routes:
-            methods_html = ""
-            for method in route["methods"]:
-                method_lower = method.lower()
-                methods_html += f'<span class="method {method_lower}">{method}</span>'
-            
-            html += f"""
-            <div class="route">
-                <h3>{methods_html} {route["path"]}</h3>
-                <p><strong>Handler:</strong> {route["endpoint"]}</p>
-                <p><strong>Signature:</strong> {route["signature"]}</p>
-                <p><strong>Source:</strong> {route["source_file"]}:{route["source_line"]}</p>
-                <p><strong>Response Model:</strong> {route["response_model"] or "None"}</p>
-                <p><strong>Dependencies:</strong> {', '.join([dep["name"] for dep in route["dependencies"]]) or "None"}</p>
-                <p><strong>Description:</strong> {route["docstring"]}</p>
-            </div>
-            """
+            methods = tuple(route["methods"])
+            # Scanner output carries the lowercased methods; other maps may not
+            methods_lower = tuple(route.get("methods_lower") or [method.lower() for method in methods])
+            parts.append(_render_route(
+                methods,
+                methods_lower,
+                route["path"],
+                route["endpoint"],
+                route["signature"],
+                route["source_file"],
+                route["source_line"],
+                route["response_model"],
+                tuple(dep["name"] for dep in route["dependencies"]),
+                route["docstring"],
+            ))
         
-        html += """
-            </div>
-        </div>
-        """
+        parts.append(_ROUTE_GROUP_CLOSE)
     
-    return html
+    return "".join(parts)
+
+@functools.lru_cache(maxsize=4096)
+def _render_route(methods, methods_lower, path, endpoint, signature, source_file,
+                  source_line, response_model, dependency_names, docstring) -> str:
+    """Render one route row; cached so unchanged routes are not re-rendered on regeneration."""
+    methods_html = "".join(
+        _METHOD_TMPL(method_lower=_esc(method_lower), method=_esc(method))
+        for method, method_lower in zip(methods, methods_lower)
+    )
+    return _ROUTE_TMPL({
+        "methods_html": methods_html,
+        "path": _esc(path),
+        "endpoint": _esc(str(endpoint)),
+        "signature": _esc(str(signature)),
+        "source_file": _esc(str(source_file)),
+        "source_line": source_line,
+        "response_model": _esc(str(response_model or "None")),
+        "deps": _esc(', '.join(dependency_names) or "None"),
+        "docstring": _esc(str(docstring)),
+    })
+
+def _route_prefix(path: str) -> str:
+    """Return the group prefix of a route path, e.g. "/api" for "/api/users"."""
+    if not path.startswith('/'):
+        path = '/' + path
+        
+    parts = path.split('/')
+    if len(parts) <= 2:
+        # Root route (like "/" or "/users")
+        return '/'
+    # Get first-level prefix like "/api" from "/api/users"
+    return '/' + parts[1]
 
 def group_routes_by_prefix(routes):
     """Group routes by common path prefixes."""
     grouped_routes = defaultdict(list)
     
     for route in routes:
-        path = route["path"]
-        if not path.startswith('/'):
-            path = '/' + path
-            
-        parts = path.split('/')
-        if len(parts) <= 2:
-            # Root route (like "/" or "/users")
-            prefix = '/'
-        else:
-            # Get first-level prefix like "/api" from "/api/users"
-            prefix = '/' + parts[1]
-            
-        grouped_routes[prefix].append(route)
+        grouped_routes[_route_prefix(route["path"])].append(route)
         
     return dict(grouped_routes)
 
+def _field_record(field) -> Tuple[Any, Any, Any, Any]:
+    """Return a field as a hashable (name, type, required, default) tuple.
+    
+    Fields are ``models.Field`` records in process and plain dicts in a map
+    decoded from the JSON endpoint. The tuples key ``_render_model``'s cache,
+    so a decoded type or default is reduced to the string it renders as.
+    """
+    if isinstance(field, Mapping):
+        default = field["default"]
+        return (
+            str(field["name"]),
+            str(field["type"]),
+            bool(field["required"]),
+            None if default is None else str(default)
+        )
+    return field
+
 def _generate_models_html(models):
     """Generate HTML for models section."""
-    html = ""
-    for model in models:
-        fields_html = ""
-        for field in model["fields"]:
-            required = "Required" if field["required"] else f"Optional, default: {field['default']}"
-            fields_html += f'<li><strong>{field["name"]}</strong>: {field["type"]} ({required})</li>'
-        
-        html += f"""
-        <div class="model">
-            <h3>{model["name"]}</h3>
-            <p><strong>Module:</strong> {model["module"]}</p>
-            <h4>Fields:</h4>
-            <ul>
-                {fields_html}
-            </ul>
-        </div>
-        """
-    return html
+    return "".join(
+        _render_model(model["name"], model["module"], tuple(map(_field_record, model["fields"])))
+        for model in models
+    )
+
+@functools.lru_cache(maxsize=4096)
+def _render_model(name, module, fields) -> str:
+    """Render one model block; cached so unchanged models are not re-rendered on regeneration."""
+    field_items = []
+    for field_name, field_type, field_required, field_default in fields:
+        required = "Required" if field_required else f"Optional, default: {field_default}"
+        field_items.append(_FIELD_TMPL(
+            name=_esc(field_name), type=_esc(str(field_type)), required=_esc(required)
+        ))
+    
+    return _MODEL_TMPL({
+        "name": _esc(name),
+        "module": _esc(module),
+        "fields_html": "".join(field_items),
+    })
 
 def _generate_dependencies_html(dependencies):
     """Generate HTML for dependencies section."""
-    html = ""
-    for endpoint, deps in dependencies.items():
-        deps_html = "<ul>" + "".join([f"<li>{dep}</li>" for dep in deps]) + "</ul>" if deps else "None"
-        html += f"""
-        <div class="dependency">
-            <h3>{endpoint}</h3>
-            <h4>Depends on:</h4>
-            {deps_html}
-        </div>
-        """
-    return html
+    return "".join(
+        _render_dependency(endpoint, tuple(deps))
+        for endpoint, deps in dependencies.items()
+    )
+
+@functools.lru_cache(maxsize=4096)
+def _render_dependency(endpoint, deps) -> str:
+    """Render one dependency block; cached so unchanged entries are not re-rendered on regeneration."""
+    deps_html = "<ul>" + "".join([f"<li>{_esc(str(dep))}</li>" for dep in deps]) + "</ul>" if deps else "None"
+    return _DEPENDENCY_TMPL({"endpoint": _esc(endpoint), "deps_html": deps_html})
 
 def generate_data_flow_visualization(data_flow_map: Dict[str, Any]) -> str:
     """Generate an HTML visualization of the data flow map."""
+    return "".join(iter_data_flow_visualization(data_flow_map))
+
+def iter_data_flow_visualization(data_flow_map: Dict[str, Any]) -> Iterator[str]:
+    """Yield the HTML visualization of the data flow map in chunks."""
+    yield _DATA_FLOW_PAGE_HEAD
     # Convert data flow map to JSON for JavaScript visualization
-    data_flow_json = json.dumps(data_flow_map, cls=SetEncoder)
+    yield _script_json(data_flow_map)
+    yield _DATA_FLOW_PAGE_MIDDLE
+    # The graph is laid out here so the browser only has to draw it
+    yield _script_json(_build_data_flow_graph(data_flow_map["data_flow"]))
+    yield _DATA_FLOW_PAGE_TAIL
+
+def write_data_flow_visualization(path: str, data_flow_map: Dict[str, Any]):
+    """Write the data flow visualization to a file without building the whole page in memory."""
+    with open(path, "w", encoding="utf-8") as f:
+        f.writelines(iter_data_flow_visualization(data_flow_map))
+
+# Node classes and (edge class, edge label) pairs of the data flow graph
+_FLOW_NODE_KINDS = ("route", "function", "database")
+_FLOW_EDGE_KINDS = (("function-call", "calls"), ("db-operation", "DB operation"))
+
+def _build_data_flow_graph(data_flow: Dict[str, Any]) -> Dict[str, Any]:
+    """Build and lay out the route, function and database operation graph."""
+    nodes = []
+    edges = []
+    node_index = {}  # Node id -> index into nodes; edges refer to nodes by index
+    added_edges = set()  # Packed source * 2**32 + target keys, no tuple per edge
+    
+    def add_node(node_id: str, label: str, kind: str) -> int:
+        index = node_index.get(node_id)
+        if index is None:
+            index = node_index[node_id] = len(nodes)
+            nodes.append({"id": node_id, "label": label, "class": kind})
+        return index
+    
+    def add_edge(source: int, target: int, label: str, kind: str):
+        key = (source << 32) | target
+        if key not in added_edges:
+            added_edges.add(key)
+            edges.append({"source": source, "target": target, "label": label, "class": kind})
+            # Shared function and DB operation nodes list their callers for
+            # the tooltip and the details tab
+            nodes[target].setdefault("callers", []).append(nodes[source]["label"])
+    
+    # Each function is one node however many places call it
+    expanded = set()
+    
+    def add_call_chain(parent: int, call_chain: List[Dict[str, Any]]):
+        # Explicit work list of (parent, chain), so deep chains can't hit the recursion limit
+        pending = [(parent, call_chain)]
+        while pending:
+            parent, call_chain = pending.pop()
+            for call in call_chain:
+                call_index = add_node(f"func_{call['function']}", call["function"], "function")
+                add_edge(parent, call_index, "calls", "function-call")
+                
+                # A function's chain is the same wherever it is called, so
+                # its nested calls are processed once
+                if call["calls"] and call_index not in expanded:
+                    expanded.add(call_index)
+                    pending.append((call_index, call["calls"]))
     
-    return f"""
+    for route in data_flow.values():
+        methods = route["methods"]
+        method_string = methods if isinstance(methods, str) else ",".join(methods)
+        route_index = add_node(f"route_{route['endpoint']}", f"{method_string} {route['path']}", "route")
+        
+        add_call_chain(route_index, route["call_chain"])
+        
+        # One node per distinct operation, shared by every route performing it
+        for op in route["db_operations"]:
+            op_index = add_node(f"db_{op['type']}_{op['operation']}", f"{op['type']}: {op['operation']}", "database")
+            add_edge(route_index, op_index, "DB operation", "db-operation")
+    
+    width, height = layout_graph(nodes, edges)
+    
+    # Shipped as parallel columns rather than one object per node/edge: no
+    # repeated keys in the page, and kinds are indices into a shared table
+    node_kinds = {kind: i for i, kind in enumerate(_FLOW_NODE_KINDS)}
+    edge_kinds = {kind: i for i, (kind, _) in enumerate(_FLOW_EDGE_KINDS)}
+    return {
+        "nodes": {
+            "id": [node["id"] for node in nodes],
+            "kind": [node_kinds[node["class"]] for node in nodes],
+            "label": [node["label"] for node in nodes],
+            "x": [node["x"] for node in nodes],
+            "y": [node["y"] for node in nodes],
+            "w": [node["w"] for node in nodes],
+            "h": [node["h"] for node in nodes],
+            "callers": [node.get("callers") for node in nodes],
+        },
+        "edges": {
+            "source": [edge["source"] for edge in edges],
+            "target": [edge["target"] for edge in edges],
+            "kind": [edge_kinds[edge["class"]] for edge in edges],
+            "points": [edge["points"] for edge in edges],
+        },
+        "node_kinds": _FLOW_NODE_KINDS,
+        "edge_kinds": _FLOW_EDGE_KINDS,
+        "width": width,
+        "height": height,
+    }
+
+
+# Static parts of the data flow page, before and after the embedded JSON
+_DATA_FLOW_PAGE_HEAD = """
     <!DOCTYPE html>
     <html>
     <head>
         <title>FastAPI Data Flow Analysis</title>
         <meta charset="UTF-8">
         <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <script src="https://d3js.org/d3.v7.min.js"></script>
+        <!-- d3 downloads in parallel with parsing the page and runs before the load event -->
+        <link rel="preconnect" href="https://d3js.org">
+        <script defer src="https://d3js.org/d3.v7.min.js"></script>
         <style>
-            body {{ font-family: Arial, sans-serif; margin: 0; padding: 20px; }}
-            .container {{ max-width: 1200px; margin: 0 auto; }}
-            .section {{ margin-bottom: 30px; }}
-            h1, h2, h3 {{ color: #333; }}
-            .tab-container {{ border: 1px solid #ddd; border-radius: 4px; overflow: hidden; }}
-            .tabs {{ display: flex; background: #f1f1f1; }}
-            .tab {{ padding: 10px 20px; cursor: pointer; }}
-            .tab.active {{ background: #fff; border-bottom: 2px solid #007bff; }}
-            .tab-content {{ display: none; padding: 20px; }}
-            .tab-content.active {{ display: block; }}
-            
-            #data-flow-visualization {{ height: 800px; border: 1px solid #ddd; border-radius: 4px; position: relative; }}
-            #graph-container {{ width: 100%; height: 100%; overflow: auto; }}
-            
-            .node rect {{ stroke: #333; fill: #fff; }}
-            .node text {{ font-size: 12px; }}
-            .node.route rect {{ fill: #61affe; }}
-            .node.function rect {{ fill: #fca130; }}
-            .node.database rect {{ fill: #49cc90; }}
-            .node.model rect {{ fill: #f93e3e; }}
-            
-            .edgePath path {{ stroke: #333; stroke-width: 1.5px; fill: none; }}
-            .edgePath.data-flow path {{ stroke: #f93e3e; }}
-            .edgePath.function-call path {{ stroke: #fca130; }}
-            .edgePath.db-operation path {{ stroke: #49cc90; }}
-            
-            .tooltip {{ 
+            body { font-family: Arial, sans-serif; margin: 0; padding: 20px; }
+            .container { max-width: 1200px; margin: 0 auto; }
+            .section { margin-bottom: 30px; }
+            h1, h2, h3 { color: #333; }
+            .tab-container { border: 1px solid #ddd; border-radius: 4px; overflow: hidden; }
+            .tabs { display: flex; background: #f1f1f1; }
+            .tab { padding: 10px 20px; cursor: pointer; }
+            .tab.active { background: #fff; border-bottom: 2px solid #007bff; }
+            .tab-content { display: none; padding: 20px; }
+            .tab-content.active { display: block; }
+            
+            #data-flow-visualization { height: 800px; border: 1px solid #ddd; border-radius: 4px; position: relative; }
+            #graph-container { width: 100%; height: 100%; overflow: auto; }
+            
+            .node rect { stroke: #333; fill: #fff; }
+            .node text { font-size: 12px; }
+            .node.route rect { fill: #61affe; }
+            .node.function rect { fill: #fca130; }
+            .node.database rect { fill: #49cc90; }
+            .node.model rect { fill: #f93e3e; }
+            
+            .edgePath path { stroke: #333; stroke-width: 1.5px; fill: none; }
+            .edgePath.data-flow path { stroke: #f93e3e; }
+            .edgePath.function-call path { stroke: #fca130; }
+            .edgePath.db-operation path { stroke: #49cc90; }
+            .edgeLabel { font-size: 10px; fill: #555; }
+            #arrowhead path { fill: #333; }
+            
+            .tooltip { 
                 position: absolute; 
                 padding: 10px; 
                 background: white; 
@@ -811,46 +1249,46 @@ def generate_data_flow_visualization(data_flow_map: Dict[str, Any]) -> str:
                 box-shadow: 0 2px 4px rgba(0,0,0,0.2);
                 max-width: 300px;
                 z-index: 1000;
-            }}
+            }
             
-            .route-details {{
+            .route-details {
                 margin-bottom: 20px;
                 padding: 15px;
                 border: 1px solid #ddd;
                 border-radius: 4px;
-            }}
+            }
             
-            .route-details h3 {{
+            .route-details h3 {
                 margin-top: 0;
                 border-bottom: 1px solid #eee;
                 padding-bottom: 10px;
-            }}
+            }
             
-            .function-call {{
+            .function-call {
                 padding: 8px;
                 margin: 5px 0;
                 background-color: #f8f9fa;
                 border-radius: 4px;
                 border-left: 4px solid #fca130;
-            }}
+            }
             
-            .db-operation {{
+            .db-operation {
                 padding: 8px;
                 margin: 5px 0;
                 background-color: #f8f9fa;
                 border-radius: 4px;
                 border-left: 4px solid #49cc90;
-            }}
+            }
             
-            .data-reference {{
+            .data-reference {
                 padding: 8px;
                 margin: 5px 0;
                 background-color: #f8f9fa;
                 border-radius: 4px;
                 border-left: 4px solid #f93e3e;
-            }}
+            }
             
-            .legend {{ 
+            .legend { 
                 position: absolute; 
                 top: 10px; 
                 right: 10px; 
@@ -859,30 +1297,30 @@ def generate_data_flow_visualization(data_flow_map: Dict[str, Any]) -> str:
                 border: 1px solid #ddd; 
                 border-radius: 4px; 
                 box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            }}
+            }
             
-            .legend-item {{ 
+            .legend-item { 
                 display: flex; 
                 align-items: center; 
                 margin-bottom: 5px; 
-            }}
+            }
             
-            .legend-color {{ 
+            .legend-color { 
                 width: 15px; 
                 height: 15px; 
                 margin-right: 8px; 
                 border-radius: 3px; 
                 display: inline-block; 
-            }}
+            }
             
-            pre.code {{
+            pre.code {
                 background: #f6f8fa;
                 padding: 10px;
                 border-radius: 5px;
                 overflow-x: auto;
-            }}
+            }
             
-            .controls {{
+            .controls {
                 position: absolute;
                 bottom: 10px;
                 left: 10px;
@@ -892,7 +1330,7 @@ def generate_data_flow_visualization(data_flow_map: Dict[str, Any]) -> str:
                 border: 1px solid #ddd;
                 box-shadow: 0 2px 4px rgba(0,0,0,0.1);
                 z-index: 100;
-            }}
+            }
         </style>
     </head>
     <body>
@@ -947,284 +1385,431 @@ def generate_data_flow_visualization(data_flow_map: Dict[str, Any]) -> str:
             </div>
         </div>
         
-        <script src="https://d3js.org/d3.v7.min.js"></script>
-        <script src="https://unpkg.com/dagre-d3@0.6.4/dist/dagre-d3.min.js"></script>
-        
         <script>
             // Store data flow map
-            const dataFlowMap = {data_flow_json};
+            const dataFlowMap = """
+_DATA_FLOW_PAGE_MIDDLE = """;
+            
+            // Nodes (with centre positions and sizes) and edges (with curve
+            // points) of the flow graph, laid out server side, as columns
+            const packedFlowGraph = """
+_DATA_FLOW_PAGE_TAIL = """;
+            const dataFlowGraph = unpackFlowGraph(packedFlowGraph);
             
-            function openTab(evt, tabName) {{
+            // Rebuild node and edge objects from the columns in one pass each;
+            // class strings come from the shared kind tables
+            function unpackFlowGraph(packed) {
+                const n = packed.nodes;
+                const nodes = new Array(n.id.length);
+                for (let i = 0; i < nodes.length; i++) {
+                    nodes[i] = {
+                        id: n.id[i],
+                        label: n.label[i],
+                        "class": packed.node_kinds[n.kind[i]],
+                        x: n.x[i],
+                        y: n.y[i],
+                        w: n.w[i],
+                        h: n.h[i],
+                        callers: n.callers[i]
+                    };
+                }
+                
+                const e = packed.edges;
+                const edges = new Array(e.source.length);
+                for (let i = 0; i < edges.length; i++) {
+                    const [edgeClass, label] = packed.edge_kinds[e.kind[i]];
+                    edges[i] = { source: e.source[i], target: e.target[i], "class": edgeClass, label, points: e.points[i] };
+                }
+                
+                return { nodes, edges, width: packed.width, height: packed.height };
+            }
+            
+            function openTab(evt, tabName) {
                 const tabContents = document.getElementsByClassName("tab-content");
-                for (let i = 0; i < tabContents.length; i++) {{
+                for (let i = 0; i < tabContents.length; i++) {
                     tabContents[i].classList.remove("active");
-                }}
+                }
                 
                 const tabs = document.getElementsByClassName("tab");
-                for (let i = 0; i < tabs.length; i++) {{
+                for (let i = 0; i < tabs.length; i++) {
                     tabs[i].classList.remove("active");
-                }}
+                }
                 
                 document.getElementById(tabName).classList.add("active");
                 evt.currentTarget.classList.add("active");
                 
-                if (tabName === 'details-tab') {{
+                if (tabName === 'details-tab') {
                     renderRouteDetails();
-                }}
-            }}
+                }
+            }
+            
+            // Above this many nodes the graph is drawn on a canvas rather than as SVG elements
+            const CANVAS_NODE_THRESHOLD = 1000;
+            const NODE_FILLS = { route: '#61affe', function: '#fca130', database: '#49cc90', model: '#f93e3e' };
+            const EDGE_STROKES = { 'function-call': '#fca130', 'db-operation': '#49cc90', 'data-flow': '#f93e3e' };
             
-            function renderGraph() {{
+            function renderGraph() {
+                const container = document.getElementById('graph-container');
+                
                 // Clear the container
-                document.getElementById('graph-container').innerHTML = '';
-                
-                // Create a new directed graph
-                const g = new dagreD3.graphlib.Graph().setGraph({{
-                    rankdir: "TB",
-                    ranksep: 70,
-                    nodesep: 50,
-                    edgesep: 10,
-                    marginx: 20,
-                    marginy: 20
-                }});
-                
-                // Process data flow map to create graph
-                const routes = dataFlowMap.data_flow;
-                const addedNodes = new Set();
-                const addedEdges = new Set();
-                
-                // Create nodes for each route
-                Object.values(routes).forEach(route => {{
-                    const routeId = `route_${{route.endpoint}}`;
-                    
-                    if (!addedNodes.has(routeId)) {{
-                        g.setNode(routeId, {{
-                            label: `${{route.methods}} ${{route.path}}`,
-                            class: "route",
-                            rx: 5,
-                            ry: 5,
-                            padding: 10,
-                            shape: "rect"
-                        }});
-                        addedNodes.add(routeId);
-                    }}
-                    
-                    // Process call chain
-                    processCallChain(g, routeId, route.call_chain, addedNodes, addedEdges);
-                    
-                    // Process DB operations
-                    route.db_operations.forEach((op, i) => {{
-                        const opId = `db_${{route.endpoint}}_${{i}}`;
-                        
-                        if (!addedNodes.has(opId)) {{
-                            g.setNode(opId, {{
-                                label: `${{op.type}}: ${{op.operation}}`,
-                                class: "database",
-                                rx: 5,
-                                ry: 5,
-                                padding: 10,
-                                shape: "rect"
-                            }});
-                            addedNodes.add(opId);
-                        }}
-                        
-                        const edgeId = `${{routeId}}_${{opId}}`;
-                        if (!addedEdges.has(edgeId)) {{
-                            g.setEdge(routeId, opId, {{
-                                label: "DB operation",
-                                class: "db-operation",
-                                curve: d3.curveBasis
-                            }});
-                            addedEdges.add(edgeId);
-                        }}
-                    }});
-                }});
-                
-                // Create a renderer and run it
-                const render = new dagreD3.render();
+                container.innerHTML = '';
+                
+                const graph = dataFlowGraph;
+                const width = container.clientWidth;
+                const height = container.clientHeight;
+                
+                // Initial zoom to fit the graph
+                const initialScale = Math.min(width / graph.width, height / graph.height) * 0.9;
+                const initialTransform = d3.zoomIdentity
+                    .translate((width - graph.width * initialScale) / 2, (height - graph.height * initialScale) / 2)
+                    .scale(initialScale);
+                
+                if (graph.nodes.length > CANVAS_NODE_THRESHOLD) {
+                    renderCanvasGraph(container, graph, width, height, initialTransform);
+                    return;
+                }
                 
                 // Set up SVG 
-                const svg = d3.select("#graph-container").append("svg")
+                const svg = d3.select(container).append("svg")
                     .attr("width", "100%")
                     .attr("height", "100%");
                 
+                svg.append("defs").append("marker")
+                    .attr("id", "arrowhead")
+                    .attr("viewBox", "0 0 10 10")
+                    .attr("refX", 9)
+                    .attr("refY", 5)
+                    .attr("markerWidth", 8)
+                    .attr("markerHeight", 6)
+                    .attr("orient", "auto")
+                    .append("path")
+                    .attr("d", "M 0 0 L 10 5 L 0 10 z");
+                
                 const inner = svg.append("g");
                 
-                // Run the renderer
-                render(inner, g);
+                // Edges follow the precomputed points
+                const line = d3.line().curve(d3.curveBasis);
+                const edge = inner.append("g")
+                    .selectAll("g")
+                    .data(graph.edges)
+                    .join("g")
+                    .attr("class", d => `edgePath ${d["class"]}`);
+                
+                edge.append("path")
+                    .attr("d", d => line(d.points))
+                    .attr("marker-end", "url(#arrowhead)");
+                
+                edge.append("text")
+                    .attr("class", "edgeLabel")
+                    .attr("x", d => d.points[d.points.length >> 1][0])
+                    .attr("y", d => d.points[d.points.length >> 1][1])
+                    .attr("text-anchor", "middle")
+                    .text(d => d.label);
+                
+                // Nodes are drawn centred on their precomputed positions
+                const node = inner.append("g")
+                    .selectAll("g")
+                    .data(graph.nodes)
+                    .join("g")
+                    .attr("class", d => `node ${d["class"]}`)
+                    .attr("transform", d => `translate(${d.x},${d.y})`);
+                
+                node.append("rect")
+                    .attr("x", d => -d.w / 2)
+                    .attr("y", d => -d.h / 2)
+                    .attr("width", d => d.w)
+                    .attr("height", d => d.h)
+                    .attr("rx", 5)
+                    .attr("ry", 5);
+                
+                node.append("text")
+                    .attr("text-anchor", "middle")
+                    .attr("dy", "0.35em")
+                    .text(d => d.label);
                 
-                // Center the graph
-                const svgWidth = parseInt(svg.style('width'));
-                const svgHeight = parseInt(svg.style('height'));
-                const graphWidth = g.graph().width;
-                const graphHeight = g.graph().height;
+                // Add tooltips
+                node.append("title").text(nodeTitle);
                 
                 // Create zoom behavior
-                const zoom = d3.zoom().on("zoom", function(event) {{
+                const zoom = d3.zoom().on("zoom", function(event) {
                     inner.attr("transform", event.transform);
-                }});
+                });
                 
                 svg.call(zoom);
-                
-                // Initial zoom to fit the graph
-                const initialScale = Math.min(svgWidth / graphWidth, svgHeight / graphHeight) * 0.9;
-                const initialX = (svgWidth - graphWidth * initialScale) / 2;
-                const initialY = (svgHeight - graphHeight * initialScale) / 2;
-                
-                svg.call(zoom.transform, d3.zoomIdentity
-                    .translate(initialX, initialY)
-                    .scale(initialScale));
-                
-                // Add tooltips
-                inner.selectAll("g.node")
-                    .append("title")
-                    .text(function(id) {{
-                        const node = g.node(id);
-                        return node.label;
-                    }});
-                
-                // Add zoom controls
-                document.getElementById('zoom-in').addEventListener('click', function() {{
-                    svg.transition().call(zoom.scaleBy, 1.2);
-                }});
-                
-                document.getElementById('zoom-out').addEventListener('click', function() {{
-                    svg.transition().call(zoom.scaleBy, 1 / 1.2);
-                }});
-                
-                document.getElementById('reset').addEventListener('click', function() {{
-                    svg.transition().call(zoom.transform, d3.zoomIdentity
-                        .translate(initialX, initialY)
-                        .scale(initialScale));
-                }});
-            }}
-            
-            function processCallChain(g, parentId, callChain, addedNodes, addedEdges) {{
-                if (!callChain || !callChain.length) return;
-                
-                callChain.forEach((call, i) => {{
-                    const callId = `func_${{call.function}}_${{i}}`;
-                    
-                    if (!addedNodes.has(callId)) {{
-                        g.setNode(callId, {{
-                            label: call.function,
-                            class: "function",
-                            rx: 5,
-                            ry: 5,
-                            padding: 10,
-                            shape: "rect"
-                        }});
-                        addedNodes.add(callId);
-                    }}
-                    
-                    const edgeId = `${{parentId}}_${{callId}}`;
-                    if (!addedEdges.has(edgeId)) {{
-                        g.setEdge(parentId, callId, {{
-                            label: "calls",
-                            class: "function-call",
-                            curve: d3.curveBasis
-                        }});
-                        addedEdges.add(edgeId);
-                    }}
+                svg.call(zoom.transform, initialTransform);
+                setZoomControls(svg, zoom, initialTransform);
+            }
+            
+            function nodeTitle(d) {
+                return d.callers ? `${d.label}\nCalled from: ${d.callers.join(", ")}` : d.label;
+            }
+            
+            function setZoomControls(target, zoom, initialTransform) {
+                d3.select('#zoom-in').on('click', () => {
+                    target.transition().call(zoom.scaleBy, 1.2);
+                });
+                d3.select('#zoom-out').on('click', () => {
+                    target.transition().call(zoom.scaleBy, 1 / 1.2);
+                });
+                d3.select('#reset').on('click', () => {
+                    target.transition().call(zoom.transform, initialTransform);
+                });
+            }
+            
+            function renderCanvasGraph(container, graph, width, height, initialTransform) {
+                const ratio = window.devicePixelRatio || 1;
+                const canvas = d3.select(container).append('canvas')
+                    .attr('width', width * ratio)
+                    .attr('height', height * ratio)
+                    .style('width', width + 'px')
+                    .style('height', height + 'px');
+                const context = canvas.node().getContext('2d');
+                const tooltip = d3.select(container).append('div')
+                    .attr('class', 'tooltip')
+                    .style('white-space', 'pre-line')
+                    .style('opacity', 0);
+                let transform = initialTransform;
+                
+                // Edges grouped by class so each colour is stroked as one path
+                const edgesByClass = d3.group(graph.edges, e => e["class"]);
+                const line = d3.line().curve(d3.curveBasis).context(context);
+                
+                // Bounding boxes of the edge curves (which stay inside their
+                // points' hull), computed once for viewport culling
+                graph.edges.forEach(e => {
+                    const [x0, x1] = d3.extent(e.points, p => p[0]);
+                    const [y0, y1] = d3.extent(e.points, p => p[1]);
+                    e.box = { x0, y0, x1, y1 };
+                });
+                let drawPending = false;
+                
+                // Nodes are picked by their centre; the search radius covers the widest box
+                const quadtree = d3.quadtree()
+                    .x(n => n.x)
+                    .y(n => n.y)
+                    .addAll(graph.nodes);
+                const pickRadius = d3.max(graph.nodes, n => Math.max(n.w, n.h) / 2) || 0;
+                
+                // Coalesce zoom events into at most one redraw per frame
+                function scheduleDraw() {
+                    if (!drawPending) {
+                        drawPending = true;
+                        requestAnimationFrame(draw);
+                    }
+                }
+                
+                function draw() {
+                    drawPending = false;
                     
-                    // Process nested calls
-                    if (call.calls && call.calls.length) {{
-                        processCallChain(g, callId, call.calls, addedNodes, addedEdges);
-                    }}
-                }});
-            }}
-            
-            function renderRouteDetails() {{
-                const container = document.getElementById("route-details-container");
-                container.innerHTML = "";
-                
-                const routes = dataFlowMap.data_flow;
-                Object.values(routes).forEach(route => {{
-                    const routeDiv = document.createElement("div");
-                    routeDiv.className = "route-details";
+                    // The part of the graph inside the viewport; everything
+                    // else is skipped
+                    const [left, top] = transform.invert([0, 0]);
+                    const [right, bottom] = transform.invert([width, height]);
+                    const nodeVisible = n => n.x + n.w / 2 >= left && n.x - n.w / 2 <= right &&
+                        n.y + n.h / 2 >= top && n.y - n.h / 2 <= bottom;
+                    const edgeVisible = e => e.box.x1 >= left && e.box.x0 <= right &&
+                        e.box.y1 >= top && e.box.y0 <= bottom;
+                    const visibleNodes = graph.nodes.filter(nodeVisible);
                     
-                    // Create route header
-                    const title = document.createElement("h3");
-                    title.textContent = `${{Array.isArray(route.methods) ? route.methods.join(", ") : route.methods}} ${{route.path}}`;
-                    routeDiv.appendChild(title);
+                    context.save();
+                    context.setTransform(ratio, 0, 0, ratio, 0, 0);
+                    context.clearRect(0, 0, width, height);
+                    context.translate(transform.x, transform.y);
+                    context.scale(transform.k, transform.k);
                     
-                    // Route info
-                    const info = document.createElement("p");
-                    info.innerHTML = `<strong>Endpoint:</strong> ${{route.endpoint}}`;
-                    routeDiv.appendChild(info);
+                    context.lineWidth = 1.5;
+                    edgesByClass.forEach((edges, edgeClass) => {
+                        context.strokeStyle = EDGE_STROKES[edgeClass] || '#333';
+                        context.beginPath();
+                        edges.forEach(e => {
+                            if (edgeVisible(e)) line(e.points);
+                        });
+                        context.stroke();
+                    });
                     
-                    // Function calls section
-                    if (route.call_chain && route.call_chain.length > 0) {{
-                        const callsHeader = document.createElement("h4");
-                        callsHeader.textContent = "Function Call Chain:";
-                        routeDiv.appendChild(callsHeader);
-                        
-                        const callsDiv = document.createElement("div");
-                        renderCallChain(callsDiv, route.call_chain, 0);
-                        routeDiv.appendChild(callsDiv);
-                    }}
+                    context.strokeStyle = '#333';
+                    context.lineWidth = 1;
+                    visibleNodes.forEach(n => {
+                        context.fillStyle = NODE_FILLS[n["class"]] || '#fff';
+                        context.fillRect(n.x - n.w / 2, n.y - n.h / 2, n.w, n.h);
+                        context.strokeRect(n.x - n.w / 2, n.y - n.h / 2, n.w, n.h);
+                    });
                     
-                    // Database operations section
-                    if (route.db_operations && route.db_operations.length > 0) {{
-                        const dbHeader = document.createElement("h4");
-                        dbHeader.textContent = "Database Operations:";
-                        routeDiv.appendChild(dbHeader);
+                    // Labels only once they are large enough to read
+                    if (transform.k > 0.5) {
+                        context.fillStyle = '#000';
+                        context.font = '12px Arial, sans-serif';
+                        context.textAlign = 'center';
+                        context.textBaseline = 'middle';
+                        visibleNodes.forEach(n => context.fillText(n.label, n.x, n.y));
+                    }
+                    context.restore();
+                }
+                
+                function nodeAt(event) {
+                    const [x, y] = transform.invert(d3.pointer(event, canvas.node()));
+                    const found = quadtree.find(x, y, pickRadius);
+                    // The nearest centre may still lie outside its box
+                    if (found && Math.abs(found.x - x) <= found.w / 2 && Math.abs(found.y - y) <= found.h / 2) {
+                        return found;
+                    }
+                    return null;
+                }
+                
+                // Pan and zoom by redrawing with a new transform
+                const zoom = d3.zoom().on('zoom', event => {
+                    transform = event.transform;
+                    scheduleDraw();
+                });
+                canvas.call(zoom).call(zoom.transform, initialTransform);
+                
+                canvas
+                    .on('mousemove', event => {
+                        const found = nodeAt(event);
+                        tooltip.style('opacity', found ? 0.9 : 0);
+                        if (found) {
+                            const [x, y] = d3.pointer(event, container);
+                            tooltip.text(nodeTitle(found))
+                                .style('left', (x + 10) + 'px')
+                                .style('top', (y - 28) + 'px');
+                        }
+                    })
+                    .on('mouseleave', () => tooltip.style('opacity', 0));
+                
+                setZoomControls(canvas, zoom, initialTransform);
+                scheduleDraw();
+            }
+            
+            // dataFlowMap never changes after load, so the details pane is built
+            // once and simply shown again on later visits to the tab
+            let routeDetailsRendered = false;
+            
+            function renderRouteDetails() {
+                if (routeDetailsRendered) {
+                    return;
+                }
+                routeDetailsRendered = true;
+                
+                // Routes performing each DB operation, from the shared graph nodes
+                const dbOpCallers = new Map(
+                    dataFlowGraph.nodes.filter(n => n["class"] === "database").map(n => [n.id, n.callers])
+                );
+                
+                const routes = Object.values(dataFlowMap.data_flow);
+                const container = document.getElementById("route-details-container");
+                if (!('IntersectionObserver' in window)) {
+                    // One HTML string for every route, parsed once on assignment
+                    container.innerHTML = routes.map(route => routeDetailsHtml(route, dbOpCallers)).join("");
+                    return;
+                }
+                
+                // Cheap placeholders first; each route's section is built only
+                // when its placeholder comes near the viewport
+                container.innerHTML = routes.map((route, i) =>
+                    `<div class="route-details-placeholder" data-idx="${i}" style="min-height: 120px"></div>`
+                ).join("");
+                
+                const observer = new IntersectionObserver(entries => {
+                    entries.forEach(entry => {
+                        if (entry.isIntersecting) {
+                            observer.unobserve(entry.target);
+                            entry.target.outerHTML = routeDetailsHtml(routes[+entry.target.dataset.idx], dbOpCallers);
+                        }
+                    });
+                }, { rootMargin: '400px' });
+                container.querySelectorAll('.route-details-placeholder').forEach(el => observer.observe(el));
+            }
+            
+            function escapeHtml(value) {
+                return String(value).replace(/[&<>"']/g, c => ({
+                    '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#x27;'
+                })[c]);
+            }
+            
+            function routeDetailsHtml(route, dbOpCallers) {
+                // Label of the route's graph node (arrays stringify comma-joined)
+                const routeLabel = `${route.methods} ${route.path}`;
+                const methods = Array.isArray(route.methods) ? route.methods.join(", ") : route.methods;
+                
+                // Route header and info
+                const parts = [
+                    '<div class="route-details">',
+                    `<h3>${escapeHtml(methods)} ${escapeHtml(route.path)}</h3>`,
+                    `<p><strong>Endpoint:</strong> ${escapeHtml(route.endpoint)}</p>`
+                ];
+                
+                // Function calls section
+                if (route.call_chain && route.call_chain.length > 0) {
+                    parts.push("<h4>Function Call Chain:</h4>", `<div>${callChainHtml(route.call_chain, 0)}</div>`);
+                }
+                
+                // Database operations section
+                if (route.db_operations && route.db_operations.length > 0) {
+                    parts.push("<h4>Database Operations:</h4>");
+                    route.db_operations.forEach(op => {
+                        parts.push(
+                            '<div class="db-operation">',
+                            `<strong>${escapeHtml(op.type)}:</strong> ${escapeHtml(op.operation)} (line ${op.line})`
+                        );
                         
-                        route.db_operations.forEach(op => {{
-                            const dbOpDiv = document.createElement("div");
-                            dbOpDiv.className = "db-operation";
-                            dbOpDiv.innerHTML = `<strong>${{op.type}}:</strong> ${{op.operation}} (line ${{op.line}})`;
-                            routeDiv.appendChild(dbOpDiv);
-                        }});
-                    }}
-                    
-                    // Data flow section
-                    const dataFlowHeader = document.createElement("h4");
-                    dataFlowHeader.textContent = "Data References:";
-                    routeDiv.appendChild(dataFlowHeader);
-                    
-                    const dataFlow = route.data_flow;
-                    if (dataFlow && dataFlow.references && dataFlow.references.length > 0) {{
-                        dataFlow.references.forEach(ref => {{
-                            const refDiv = document.createElement("div");
-                            refDiv.className = "data-reference";
-                            refDiv.textContent = ref;
-                            routeDiv.appendChild(refDiv);
-                        }});
-                    }} else {{
-                        const noData = document.createElement("p");
-                        noData.textContent = "No data references detected.";
-                        routeDiv.appendChild(noData);
-                    }}
-                    
-                    container.appendChild(routeDiv);
-                }});
-            }}
-            
-            function renderCallChain(container, calls, depth) {{
-                if (!calls || !calls.length) return;
-                
-                calls.forEach(call => {{
-                    const callDiv = document.createElement("div");
-                    callDiv.className = "function-call";
-                    callDiv.style.marginLeft = `${{depth * 20}}px`;
-                    callDiv.textContent = call.function;
-                    container.appendChild(callDiv);
+                        // Other routes performing the same operation
+                        const callers = dbOpCallers.get(`db_${op.type}_${op.operation}`) || [];
+                        if (callers.length > 1) {
+                            const others = callers.filter(c => c !== routeLabel).join(", ");
+                            parts.push(`<div>Also performed by: ${escapeHtml(others)}</div>`);
+                        }
+                        parts.push("</div>");
+                    });
+                }
+                
+                // Data flow section
+                parts.push("<h4>Data References:</h4>");
+                const dataFlow = route.data_flow;
+                if (dataFlow && dataFlow.references && dataFlow.references.length > 0) {
+                    dataFlow.references.forEach(ref => {
+                        parts.push(`<div class="data-reference">${escapeHtml(ref)}</div>`);
+                    });
+                } else {
+                    parts.push("<p>No data references detected.</p>");
+                }
+                
+                parts.push("</div>");
+                return parts.join("");
+            }
+            
+            function callChainHtml(calls, depth) {
+                if (!calls || !calls.length) return "";
+                
+                // Walk the chain depth first with an explicit stack
+                const rows = [];
+                const stack = [];
+                for (let i = calls.length - 1; i >= 0; i--) {
+                    stack.push([calls[i], depth]);
+                }
+                
+                while (stack.length) {
+                    const [call, callDepth] = stack.pop();
+                    rows.push(`<div class="function-call" style="margin-left: ${callDepth * 20}px">${escapeHtml(call.function)}</div>`);
                     
-                    // Render nested calls
-                    if (call.calls && call.calls.length) {{
-                        renderCallChain(container, call.calls, depth + 1);
-                    }}
-                }});
-            }}
+                    // Nested calls come next, in order
+                    if (call.calls) {
+                        for (let i = call.calls.length - 1; i >= 0; i--) {
+                            stack.push([call.calls[i], callDepth + 1]);
+                        }
+                    }
+                }
+                
+                return rows.join("");
+            }
             
             // Initialize visualizations
-            window.addEventListener('load', function() {{
+            window.addEventListener('load', function() {
                 renderGraph();
                 
-                if (document.getElementById('details-tab').classList.contains('active')) {{
+                if (document.getElementById('details-tab').classList.contains('active')) {
                     renderRouteDetails();
-                }}
-            }});
+                }
+            });
         </script>
     </body>
     </html>
@@ -1,7 +1,8 @@
 from fastapi import FastAPI, HTTPException, Depends, Query, Path, status
 from fastapi.security import OAuth2PasswordBearer
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from itertools import islice
+from typing import Dict, List, Optional
 from projectmapper import map_project
 
 app = FastAPI(
@@ -39,11 +40,11 @@ class ItemCreate(BaseModel):
     price: float
     is_offer: bool = False
 
-# Simulate a database with a simple list
-items_db = [
-    Item(id=1, name="Item 1", description="Description 1", price=10.5, is_offer=False),
-    Item(id=2, name="Item 2", description="Description 2", price=20.0, is_offer=True),
-]
+# Simulate a database with a dict keyed by item ID
+items_db: Dict[int, Item] = {
+    1: Item(id=1, name="Item 1", description="Description 1", price=10.5, is_offer=False),
+    2: Item(id=2, name="Item 2", description="Description 2", price=20.0, is_offer=True),
+}
 
 # Basic auth for demonstration
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
@@ -59,44 +60,40 @@ def read_root():
 
 # Get all items
 @app.get("/items/", response_model=List[Item], tags=["items"])
-def read_items(skip: int = Query(0, description="Number of items to skip"),
-               limit: int = Query(10, description="Maximum number of items to return")):
-    return items_db[skip:skip+limit]
+def read_items(skip: int = Query(0, ge=0, description="Number of items to skip"),
+               limit: int = Query(10, ge=0, description="Maximum number of items to return")):
+    return list(islice(items_db.values(), skip, skip + limit))
 
 # Get a specific item by ID
 @app.get("/items/{item_id}", response_model=Item, tags=["items"])
 def read_item(item_id: int = Path(..., title="The ID of the item to get")):
-    for item in items_db:
-        if item.id == item_id:
-            return item
-    raise HTTPException(status_code=404, detail="Item not found")
+    item = items_db.get(item_id)
+    if item is None:
+        raise HTTPException(status_code=404, detail="Item not found")
+    return item
 
 # Create a new item
 @app.post("/items/", response_model=Item, status_code=status.HTTP_201_CREATED, tags=["items"])
 def create_item(item: ItemCreate):
-    new_id = max(item.id for item in items_db) + 1 if items_db else 1
+    new_id = max(items_db, default=0) + 1
     new_item = Item(id=new_id, **item.dict())
-    items_db.append(new_item)
+    items_db[new_id] = new_item
     return new_item
 
 # Update an item
 @app.put("/items/{item_id}", response_model=Item, tags=["items"])
 def update_item(item_id: int, item: ItemCreate):
-    for idx, stored_item in enumerate(items_db):
-        if stored_item.id == item_id:
-            updated_item = Item(id=item_id, **item.dict())
-            items_db[idx] = updated_item
-            return updated_item
-    raise HTTPException(status_code=404, detail="Item not found")
+    if item_id not in items_db:
+        raise HTTPException(status_code=404, detail="Item not found")
+    updated_item = Item(id=item_id, **item.dict())
+    items_db[item_id] = updated_item
+    return updated_item
 
 # Delete an item
 @app.delete("/items/{item_id}", status_code=status.HTTP_204_NO_CONTENT, tags=["items"])
 def delete_item(item_id: int):
-    for idx, stored_item in enumerate(items_db):
-        if stored_item.id == item_id:
-            items_db.pop(idx)
-            return
-    raise HTTPException(status_code=404, detail="Item not found")
+    if items_db.pop(item_id, None) is None:
+        raise HTTPException(status_code=404, detail="Item not found")
 
 # Protected endpoint example
 @app.get("/protected/", tags=["protected"])
@@ -7,9 +7,10 @@ setup(
     install_requires=[
         "fastapi>=0.68.0",
         "pydantic>=2.11.3",
-        "graphviz>=0.20.3",
-        "ast-comments>=1.0.1",  # For better AST parsing
     ],
+    extras_require={
+        "fast": ["orjson>=3.6"],  # Faster JSON serialization of project maps
+    },
     description="A library for mapping FastAPI project structure, data flow and connections",
     author="Penify",
     python_requires=">=3.7",